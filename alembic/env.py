@@ -2,7 +2,6 @@ import asyncio
 from logging.config import fileConfig
 from typing import List
 
-from sqlalchemy import pool
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 from alembic import context
 from app.db.sql import Base
@@ -53,9 +52,11 @@ def run_migrations_offline() -> None:
 
 async def run_async_migrations() -> None:
     """Run migrations in 'online' mode (async)."""
+    # A single pooled connection is reused for every statement in the run
     connectable = create_async_engine(
         settings.DATABASE_URL,
-        poolclass=pool.NullPool,
+        pool_size=1,
+        max_overflow=0,
         echo=settings.DEBUG_MODE,
     )
 
@@ -0,0 +1,39 @@
+"""trigram search indexes
+
+Revision ID: 059c69ae31b6
+Revises: 4a90ce62237b
+Create Date: 2026-10-15 22:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '059c69ae31b6'
+down_revision: Union[str, Sequence[str], None] = '4a90ce62237b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GIN trigram indexes let the leading-wildcard ILIKE searches in
+    # get_countries and get_home_destinations use an index
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_countries_name_trgm', 'countries', ['name'],
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_home_page_destinations_city_trgm', 'home_page_destinations', ['city'],
+        postgresql_using='gin', postgresql_ops={'city': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_home_page_destinations_city_trgm', table_name='home_page_destinations')
+    op.drop_index('ix_countries_name_trgm', table_name='countries')
@@ -0,0 +1,28 @@
+"""index home destination image
+
+Revision ID: 4a90ce62237b
+Revises: dd61abb87a8f
+Create Date: 2026-10-15 22:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a90ce62237b'
+down_revision: Union[str, Sequence[str], None] = 'dd61abb87a8f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_home_page_destinations_image'), 'home_page_destinations', ['image'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_home_page_destinations_image'), table_name='home_page_destinations')
@@ -0,0 +1,36 @@
+"""image and user list indexes
+
+Revision ID: 897be19ad452
+Revises: 059c69ae31b6
+Create Date: 2026-10-15 23:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '897be19ad452'
+down_revision: Union[str, Sequence[str], None] = '059c69ae31b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite indexes matching the ORDER BY of get_images and get_users
+    op.create_index(
+        'ix_images_order_id_active', 'images', ['order', 'id'],
+        postgresql_where=sa.text('is_deleted = false')
+    )
+    op.create_index(
+        'ix_users_created_at_id', 'users', [sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_images_order_id_active', table_name='images')
@@ -0,0 +1,38 @@
+"""cities composite list index
+
+Revision ID: b7c3e1f0a2d4
+Revises: 897be19ad452
+Create Date: 2026-10-15 23:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c3e1f0a2d4'
+down_revision: Union[str, Sequence[str], None] = '897be19ad452'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One index for get_cities' filter and sort instead of three single-column ones
+    op.create_index(
+        'ix_cities_active_order_created', 'cities',
+        ['is_active', 'order', sa.text('created_at DESC')]
+    )
+    op.drop_index('ix_cities_created_at', table_name='cities', if_exists=True)
+    op.drop_index('ix_cities_is_active', table_name='cities', if_exists=True)
+    op.drop_index('ix_cities_order', table_name='cities', if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_cities_order', 'cities', ['order'])
+    op.create_index('ix_cities_is_active', 'cities', ['is_active'])
+    op.create_index('ix_cities_created_at', 'cities', ['created_at'])
+    op.drop_index('ix_cities_active_order_created', table_name='cities')
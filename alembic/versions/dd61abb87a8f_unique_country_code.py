@@ -0,0 +1,29 @@
+"""unique country code
+
+Revision ID: dd61abb87a8f
+Revises: d4e50caa5bbd
+Create Date: 2026-10-15 22:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dd61abb87a8f'
+down_revision: Union[str, Sequence[str], None] = 'd4e50caa5bbd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_country relies on this constraint for INSERT ... ON CONFLICT
+    op.create_unique_constraint('countries_country_code_key', 'countries', ['country_code'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('countries_country_code_key', 'countries', type_='unique')
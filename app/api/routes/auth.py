@@ -1,3 +1,5 @@
+import hashlib
+import hmac
 from datetime import timedelta
 from typing import Annotated
 
@@ -7,16 +9,56 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password
+from app.core.security import create_access_token, verify_dummy_password, verify_password_async
 from app.db.sql import get_db
 from app.models.user import User
 from app.schemas.user import TokenResponse
 from app.schemas.response import success_response, error_response
+from app.services.cache_service import cache_service
 import logging
 
 router = APIRouter()
 logger = logging.getLogger("api")
 
+# How long a successful password verification is remembered in Redis. This is
+# the only verification cache; entries are keyed on the stored hash, so a
+# password change makes every older entry unreachable.
+LOGIN_VERIFY_CACHE_SECONDS = 60
+
+def _verification_cache_key(user: User, password: str) -> str:
+    """
+    Build the Redis key for a successful verification
+    
+    The key is an HMAC of the password and the stored hash, so the plaintext
+    never reaches Redis and a password change invalidates old entries.
+    """
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(),
+        f"{password}:{user.hashed_password}".encode(),
+        hashlib.sha256
+    ).hexdigest()
+    return f"{settings.CACHE_PREFIX}:auth:{user.id}:{digest}"
+
+async def check_user_password(user: User, password: str) -> bool:
+    """
+    Verify a user's password without blocking the event loop
+    
+    Args:
+        user: User with a stored password hash
+        password: Plain text password from the login form
+        
+    Returns:
+        True if password matches, False otherwise
+    """
+    cache_key = _verification_cache_key(user, password)
+    if await cache_service.get(cache_key):
+        return True
+    
+    password_ok = await verify_password_async(password, user.hashed_password)
+    if password_ok:
+        await cache_service.set(cache_key, True, LOGIN_VERIFY_CACHE_SECONDS)
+    return password_ok
+
 @router.post("/login")
 async def login_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
@@ -33,71 +75,66 @@ async def login_access_token(
     Returns:
         dict: Access token and token type
     """
-    logger.info(f"Login attempt for user: {form_data.username}")
+    logger.info("Login attempt for user: %s", form_data.username)
     
-    try:
-        # Query user by email
-        result = await db.execute(
-            select(User).where(User.email == form_data.username)
-        )
-        user = result.scalar_one_or_none()
-        
-        # Verify user exists and password is correct
-        if not user or not verify_password(form_data.password, user.hashed_password):
-            logger.warning(f"Failed login attempt for user: {form_data.username} - Invalid credentials")
-            
-            response.status_code = 401
-            return error_response(
-                message="Incorrect email or password",
-                status=401,
-                error_code="INVALID_CREDENTIALS",
-                details={"username": form_data.username}
-            )
-        
-        # Check if user is active
-        if not user.is_active:
-            logger.warning(f"Failed login attempt for inactive user: {form_data.username}")
-            response.status_code = 401
-            return error_response(
-                message="Inactive user account",
-                status=401,
-                error_code="INACTIVE_USER",
-                details={"username": form_data.username}
-            )
-        
-        # Generate access token
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        token = create_access_token(
-            subject=str(user.id),
-            expires_delta=access_token_expires
-        )
-        
-        logger.info(f"Successful login for user: {form_data.username} (ID: {user.id})")
+    # Query user by email
+    result = await db.execute(
+        select(User).where(User.email == form_data.username)
+    )
+    user = result.scalar_one_or_none()
+    
+    # Always run exactly one password verification, whether or not the user exists
+    if user is None or not user.hashed_password:
+        await verify_dummy_password(form_data.password)
+        password_ok = False
+    else:
+        password_ok = await check_user_password(user, form_data.password)
+    
+    # Verify user exists and password is correct
+    if not (user and password_ok):
+        logger.warning("Failed login attempt for user: %s - Invalid credentials", form_data.username)
         
-        response.status_code = 200
-        return success_response(
-            data={
-                "access_token": token,
-                "token_type": "bearer",
-                "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # seconds
-                "user": {
-                    "id": user.id,
-                    "username": user.username,
-                    "email": user.email,
-                    "is_active": user.is_active,
-                    "is_superuser": user.is_superuser
-                }
-            },
-            message="Login successful"
+        response.status_code = 401
+        return error_response(
+            message="Incorrect email or password",
+            status=401,
+            error_code="INVALID_CREDENTIALS",
+            details={"username": form_data.username}
         )
-        
-    except Exception as e:
-        logger.error(f"Login error for user {form_data.username}: {str(e)}")
-        
-        response.status_code = 500
+    
+    # Check if user is active
+    if not user.is_active:
+        logger.warning("Failed login attempt for inactive user: %s", form_data.username)
+        response.status_code = 401
         return error_response(
-            message="An error occurred while processing your request",
-            status=500,
-            error_code="LOGIN_ERROR",
-            details={"error": str(e)}
-        )
\ No newline at end of file
+            message="Inactive user account",
+            status=401,
+            error_code="INACTIVE_USER",
+            details={"username": form_data.username}
+        )
+    
+    # Generate access token
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    token = create_access_token(
+        subject=str(user.id),
+        expires_delta=access_token_expires
+    )
+    
+    logger.info("Successful login for user: %s (ID: %s)", form_data.username, user.id)
+    
+    response.status_code = 200
+    return success_response(
+        data={
+            "access_token": token,
+            "token_type": "bearer",
+            "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,  # seconds
+            "user": {
+                "id": user.id,
+                "username": user.username,
+                "email": user.email,
+                "is_active": user.is_active,
+                "is_superuser": user.is_superuser
+            }
+        },
+        message="Login successful"
+    )
@@ -1,226 +1,206 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, delete, select, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload
 from typing import List, Optional
 
-from app.db.sql import get_db
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
+from app.db.sql import get_db, raw_pool
 from app.models.city import City
-from app.models.country import Country
 from app.schemas.city import CityOut, CityCreate, CityUpdate, CityListResponse
+from app.services.cache_service import cache_service
 import logging
 
 router = APIRouter()
 logger = logging.getLogger("api")
 
+# Static part of the 404 payload, shared by every lookup endpoint
+CITY_NOT_FOUND = {"message": "City not found", "error_code": "CITY_NOT_FOUND"}
+
+# In development, any relationship that isn't loaded explicitly raises instead
+# of silently issuing a lazy SELECT per row while CityOut is built
+CITY_READ_OPTIONS = (raiseload("*"),) if settings.DEBUG_MODE else ()
+
+# Upper bound on list page size, bounding worst-case response memory
+MAX_PAGE_SIZE = 1000
+
+# Columns backing CityOut, selected directly on list endpoints to skip ORM hydration
+CITY_OUT_FIELDS = tuple(CityOut.model_fields)
+CITY_OUT_COLUMNS = tuple(getattr(City, field) for field in CITY_OUT_FIELDS)
+
+# Validator and serializer for a whole page of rows, compiled once at import
+CITY_LIST_ADAPTER = TypeAdapter(List[CityOut])
+
+# Statements built once at import and executed with bound parameters
+CITY_BY_SLUG = select(City).options(*CITY_READ_OPTIONS).where(City.slug == bindparam("slug"))
+CITY_ID_BY_SLUG = select(City.id).where(City.slug == bindparam("slug"))
+
+# Hand-written SQL for the slug lookup, run directly on the asyncpg pool
+CITY_BY_SLUG_SQL = "SELECT {} FROM {} WHERE slug = $1".format(
+    ", ".join(f'"{column.name}" AS "{field}"' for field, column in zip(CITY_OUT_FIELDS, CITY_OUT_COLUMNS)),
+    City.__tablename__,
+)
+
 @router.post("/", response_model=CityOut)
 async def create_city(
     city: CityCreate,
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new city"""
-    logger.info(f"Creating new city: {city.name} with slug: {city.slug}")
+    logger.info("Creating new city: %s with slug: %s", city.name, city.slug)
     
+    # Single round trip: Postgres enforces slug uniqueness via ON CONFLICT
+    # and the country foreign key via the constraint on country_id
+    stmt = (
+        pg_insert(City)
+        .values(**city.model_dump())
+        .on_conflict_do_nothing(index_elements=[City.slug])
+        .returning(City)
+    )
     try:
-        # Validate foreign key: Check if country exists
-        if city.country_id:
-            country_result = await db.execute(select(Country).where(Country.id == city.country_id))
-            if not country_result.scalar_one_or_none():
-                logger.warning(f"Attempt to create city with non-existent country_id: {city.country_id}")
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "message": f"Country with ID {city.country_id} does not exist",
-                        "error_code": "COUNTRY_NOT_FOUND",
-                        "details": {"country_id": city.country_id}
-                    }
-                )
-        
-        # Check if city with slug already exists
-        result = await db.execute(select(City).where(City.slug == city.slug))
-        existing = result.scalar_one_or_none()
-        if existing:
-            logger.warning(f"Attempt to create city with existing slug: {city.slug}")
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": f"City with slug '{city.slug}' already exists",
-                    "error_code": "CITY_SLUG_EXISTS",
-                    "details": {"slug": city.slug, "existing_id": existing.id}
-                }
-            )
-        
-        # Create new city using build method
-        new_city = City.build_from_form(
-            name=city.name,
-            slug=city.slug,
-            country_id=city.country_id,
-            is_active=city.is_active,
-            image_id=city.image_id,
-            image_url=city.image_url,
-            order=city.order,
+        new_city = (await db.execute(stmt)).scalar_one_or_none()
+    except IntegrityError as e:
+        if "country_id" not in str(e.orig):
+            raise
+        logger.warning("Attempt to create city with non-existent country_id: %s", city.country_id)
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": f"Country with ID {city.country_id} does not exist",
+                "error_code": "COUNTRY_NOT_FOUND",
+                "details": {"country_id": city.country_id}
+            }
         )
-        db.add(new_city)
-        await db.commit()
-        await db.refresh(new_city)
-        
-        logger.info(f"Successfully created city: {city.name} with ID: {new_city.id}")
-        
-        return CityOut.model_validate(new_city)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Error creating city {city.name}: {str(e)}")
+    
+    if new_city is None:
+        # Slug conflict; look up the existing row only on this error path
+        existing_id = (await db.execute(CITY_ID_BY_SLUG, {"slug": city.slug})).scalar()
+        logger.warning("Attempt to create city with existing slug: %s", city.slug)
         raise HTTPException(
-            status_code=500,
+            status_code=400,
             detail={
-                "message": "Failed to create city",
-                "error_code": "CITY_CREATION_ERROR",
-                "details": {"error": str(e)}
+                "message": f"City with slug '{city.slug}' already exists",
+                "error_code": "CITY_SLUG_EXISTS",
+                "details": {"slug": city.slug, "existing_id": existing_id}
             }
         )
+    
+    await db.commit()
+    await cache_service.clear("cities")
+    
+    logger.info("Successfully created city: %s with ID: %s", city.name, new_city.id)
+    
+    return CityOut.model_validate(new_city)
 
 @router.get("/", response_model=CityListResponse)
+@cache_service.cached(namespace="cities")
 async def get_cities(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=0, le=MAX_PAGE_SIZE),
     is_active: Optional[bool] = None,
     country_id: Optional[int] = None,
     search: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """Get all cities with optional filtering and pagination"""
-    logger.info(f"Fetching cities - skip: {skip}, limit: {limit}, is_active: {is_active}, country_id: {country_id}, search: {search}")
+    logger.info("Fetching cities - skip: %s, limit: %s, is_active: %s, country_id: %s, search: %s", skip, limit, is_active, country_id, search)
     
-    try:
-        # Build query
-        query = select(City)
-        count_query = select(func.count(City.id))
+    # Build query; the window column carries the filtered total on every
+    # row so the count and the page come back in one round trip
+    query = select(*CITY_OUT_COLUMNS, func.count().over().label("total"))
+    
+    # Apply filters
+    filters = []
+    if is_active is not None:
+        filters.append(City.is_active == is_active)
         
-        # Apply filters
-        if is_active is not None:
-            query = query.where(City.is_active == is_active)
-            count_query = count_query.where(City.is_active == is_active)
-            
-        if country_id is not None:
-            query = query.where(City.country_id == country_id)
-            count_query = count_query.where(City.country_id == country_id)
-            
-        if search:
-            search_filter = City.name.ilike(f"%{search}%")
-            query = query.where(search_filter)
-            count_query = count_query.where(search_filter)
+    if country_id is not None:
+        filters.append(City.country_id == country_id)
         
-        # Get total count
-        total_result = await db.execute(count_query)
+    if search:
+        filters.append(City.name.ilike(f"%{search}%"))
+    
+    # Apply pagination and execute
+    query = query.where(*filters).offset(skip).limit(limit).order_by(City.order.asc(), City.created_at.desc())
+    
+    # Stream plain column rows, then build the page in one batch validation
+    # call (the extra "total" key is ignored by CityOut)
+    rows = []
+    total = 0
+    async for row in (await db.stream(query)).mappings():
+        total = row["total"]
+        rows.append(dict(row))
+    cities_data = CITY_LIST_ADAPTER.validate_python(rows)
+    
+    if not cities_data and (skip > 0 or limit == 0):
+        # An empty page (past the end, or limit=0) has no rows to carry the
+        # window total
+        total_result = await db.execute(select(func.count(City.id)).where(*filters))
         total = total_result.scalar() or 0
-        
-        # Apply pagination and execute
-        query = query.offset(skip).limit(limit).order_by(City.order.asc(), City.created_at.desc())
-        result = await db.execute(query)
-        cities = result.scalars().all()
-        
-        # Convert to CityOut schemas
-        cities_data = [CityOut.model_validate(city) for city in cities]
-        
-        logger.info(f"Successfully retrieved {len(cities)} cities")
-        
-        return CityListResponse(
-            cities=cities_data,
-            total=total,
-            page=(skip // limit) + 1 if limit > 0 else 1,
-            limit=limit
-        )
-        
-    except Exception as e:
-        logger.error(f"Error fetching cities: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to retrieve cities",
-                "error_code": "DATABASE_ERROR",
-                "details": {"error": str(e)}
-            }
-        )
+    
+    logger.info("Successfully retrieved %s cities", len(cities_data))
+    
+    # Serialize the page with the prebuilt list adapter and render the outer
+    # dict directly, skipping the response_model re-validation of every item
+    return ORJSONResponse(content={
+        "cities": CITY_LIST_ADAPTER.dump_python(cities_data, mode="json"),
+        "total": total,
+        "page": (skip // limit) + 1 if limit > 0 else 1,
+        "limit": limit
+    })
 
 @router.get("/{city_id}", response_model=CityOut)
+@cache_service.cached(namespace="cities")
 async def get_city(
     city_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     """Get city by ID"""
-    logger.info(f"Fetching city with ID: {city_id}")
+    logger.info("Fetching city with ID: %s", city_id)
     
-    try:
-        result = await db.execute(select(City).where(City.id == city_id))
-        city = result.scalar_one_or_none()
-        
-        if not city:
-            logger.warning(f"City with ID {city_id} not found")
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "message": "City not found",
-                    "error_code": "CITY_NOT_FOUND",
-                    "details": {"city_id": city_id}
-                }
-            )
-        
-        logger.info(f"Successfully retrieved city: {city.name}")
-        return CityOut.model_validate(city)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching city {city_id}: {str(e)}")
+    city = await db.get(City, city_id, options=CITY_READ_OPTIONS)
+    
+    if not city:
+        logger.warning("City with ID %s not found", city_id)
         raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to retrieve city",
-                "error_code": "DATABASE_ERROR",
-                "details": {"error": str(e)}
-            }
+            status_code=404,
+            detail={**CITY_NOT_FOUND, "details": {"city_id": city_id}}
         )
+    
+    logger.info("Successfully retrieved city: %s", city.name)
+    return CityOut.model_validate(city)
 
 @router.get("/slug/{slug}", response_model=CityOut)
+@cache_service.cached(namespace="cities")
 async def get_city_by_slug(
     slug: str,
     db: AsyncSession = Depends(get_db)
 ):
     """Get city by slug"""
-    logger.info(f"Fetching city with slug: {slug}")
+    logger.info("Fetching city with slug: %s", slug)
     
-    try:
-        result = await db.execute(select(City).where(City.slug == slug))
+    if raw_pool.pool:
+        # Hot path: asyncpg prepared statement, row already in CityOut shape
+        row = await raw_pool.fetchrow(CITY_BY_SLUG_SQL, slug)
+        city = CityOut.model_construct(**dict(row)) if row else None
+    else:
+        result = await db.execute(CITY_BY_SLUG, {"slug": slug})
         city = result.scalar_one_or_none()
-        
-        if not city:
-            logger.warning(f"City with slug {slug} not found")
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "message": "City not found",
-                    "error_code": "CITY_NOT_FOUND",
-                    "details": {"slug": slug}
-                }
-            )
-        
-        logger.info(f"Successfully retrieved city: {city.name}")
-        return CityOut.model_validate(city)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching city by slug {slug}: {str(e)}")
+        city = CityOut.model_validate(city) if city else None
+    
+    if not city:
+        logger.warning("City with slug %s not found", slug)
         raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to retrieve city",
-                "error_code": "DATABASE_ERROR",
-                "details": {"error": str(e)}
-            }
+            status_code=404,
+            detail={**CITY_NOT_FOUND, "details": {"slug": slug}}
         )
+    
+    logger.info("Successfully retrieved city: %s", city.name)
+    return city
 
 @router.put("/{city_id}", response_model=CityOut)
 async def update_city(
@@ -229,60 +209,48 @@ async def update_city(
     db: AsyncSession = Depends(get_db)
 ):
     """Update an existing city"""
-    logger.info(f"Updating city with ID: {city_id}")
+    logger.info("Updating city with ID: %s", city_id)
     
-    try:
-        result = await db.execute(select(City).where(City.id == city_id))
-        city = result.scalar_one_or_none()
-        
-        if not city:
-            logger.warning(f"City with ID {city_id} not found for update")
+    update_data = city_update.model_dump(exclude_unset=True)
+    
+    if update_data:
+        # One UPDATE ... RETURNING instead of SELECT, flush and refresh;
+        # country_id is validated by the foreign key constraint
+        stmt = (
+            update(City)
+            .where(City.id == city_id)
+            .values(**update_data)
+            .returning(City)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            city = (await db.execute(stmt)).scalar_one_or_none()
+        except IntegrityError as e:
+            if "country_id" not in str(e.orig):
+                raise
             raise HTTPException(
-                status_code=404,
+                status_code=400,
                 detail={
-                    "message": "City not found",
-                    "error_code": "CITY_NOT_FOUND",
-                    "details": {"city_id": city_id}
+                    "message": f"Country with ID {update_data['country_id']} does not exist",
+                    "error_code": "COUNTRY_NOT_FOUND",
+                    "details": {"country_id": update_data['country_id']}
                 }
             )
-        
-        # Validate country_id if being updated
-        update_data = city_update.model_dump(exclude_unset=True)
-        if 'country_id' in update_data and update_data['country_id']:
-            country_result = await db.execute(select(Country).where(Country.id == update_data['country_id']))
-            if not country_result.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "message": f"Country with ID {update_data['country_id']} does not exist",
-                        "error_code": "COUNTRY_NOT_FOUND",
-                        "details": {"country_id": update_data['country_id']}
-                    }
-                )
-        
-        # Update fields that are provided
-        for field, value in update_data.items():
-            setattr(city, field, value)
-        
-        await db.commit()
-        await db.refresh(city)
-        
-        logger.info(f"Successfully updated city: {city.name}")
-        return CityOut.model_validate(city)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Error updating city {city_id}: {str(e)}")
+    else:
+        city = await db.get(City, city_id)
+    
+    if not city:
+        logger.warning("City with ID %s not found for update", city_id)
         raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to update city",
-                "error_code": "CITY_UPDATE_ERROR",
-                "details": {"error": str(e)}
-            }
+            status_code=404,
+            detail={**CITY_NOT_FOUND, "details": {"city_id": city_id}}
         )
+    
+    await db.commit()
+    await cache_service.clear("cities")
+    
+    logger.info("Successfully updated city: %s", city.name)
+    return CityOut.model_validate(city)
 
 @router.delete("/{city_id}", status_code=204)
 async def delete_city(
@@ -290,39 +258,21 @@ async def delete_city(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a city"""
-    logger.info(f"Deleting city with ID: {city_id}")
+    logger.info("Deleting city with ID: %s", city_id)
     
-    try:
-        result = await db.execute(select(City).where(City.id == city_id))
-        city = result.scalar_one_or_none()
-        
-        if not city:
-            logger.warning(f"City with ID {city_id} not found for deletion")
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "message": "City not found",
-                    "error_code": "CITY_NOT_FOUND",
-                    "details": {"city_id": city_id}
-                }
-            )
-        
-        await db.delete(city)
-        await db.commit()
-        
-        logger.info(f"Successfully deleted city: {city.name}")
-        return None
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Error deleting city {city_id}: {str(e)}")
+    # Single DELETE ... RETURNING; no ORM object is loaded first
+    stmt = delete(City).where(City.id == city_id).returning(City.id, City.name)
+    city = (await db.execute(stmt)).one_or_none()
+    
+    if city is None:
+        logger.warning("City with ID %s not found for deletion", city_id)
         raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to delete city",
-                "error_code": "CITY_DELETION_ERROR",
-                "details": {"error": str(e)}
-            }
+            status_code=404,
+            detail={**CITY_NOT_FOUND, "details": {"city_id": city_id}}
         )
+    
+    await db.commit()
+    await cache_service.clear("cities")
+    
+    logger.info("Successfully deleted city: %s", city.name)
+    return None
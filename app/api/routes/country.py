@@ -1,16 +1,52 @@
-from fastapi import APIRouter, Depends, Form, HTTPException
+from fastapi import APIRouter, Depends, Form, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, delete, or_, select, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import List, Optional
+import orjson
 
+from app.core.responses import ORJSONResponse
 from app.db.sql import get_db
 from app.models.country import Country
-from app.schemas.country import CountryOut, CountryCreate, CountryUpdate, CountryListResponse
+from app.schemas.country import CountryOut, CountryCreate, CountryUpdate, CountryListResponse, location_to_str
+from app.services.cache_service import LocalCache, cache_service
 import logging
 
 router = APIRouter()
 logger = logging.getLogger("api")
 
+# Static part of the 404 payload, shared by every lookup endpoint
+COUNTRY_NOT_FOUND = {"message": "Country not found", "error_code": "COUNTRY_NOT_FOUND"}
+
+# CountryOut fields, read straight off ORM rows; values are already typed, so
+# responses are built with model_construct instead of re-validating
+COUNTRY_OUT_FIELDS = tuple(CountryOut.model_fields)
+
+# Rows fetched per round trip while streaming country list pages
+COUNTRY_STREAM_BATCH = 200
+
+# Serialized get_country_by_slug bodies, keyed by slug. Slug lookups back URL
+# routing and repeat constantly, so hits skip the database, Pydantic and Redis.
+country_slug_cache = LocalCache(maxsize=1024, ttl=30)
+
+# Statements built once at import; handlers only bind parameters
+COUNTRY_BY_SLUG = select(Country).where(Country.slug == bindparam("slug"))
+
+def _country_out(country: Country) -> CountryOut:
+    """Build a CountryOut from a loaded Country row without validation"""
+    return CountryOut.model_construct(**{field: getattr(country, field) for field in COUNTRY_OUT_FIELDS})
+
+def _country_row(country: Country) -> dict:
+    """
+    Build the CountryOut-shaped dict for a list item
+
+    orjson encodes the plain dict natively, so list pages skip Pydantic's
+    per-field serialization entirely.
+    """
+    row = {field: getattr(country, field) for field in COUNTRY_OUT_FIELDS}
+    row["location"] = location_to_str(row["location"])
+    return row
+
 @router.post("/", response_model=CountryOut)
 async def create_country(
     name: str = Form(...),
@@ -38,10 +74,14 @@ async def create_country(
     Returns:
         CountryOut: Created country information
     """
-    logger.info(f"Creating new country: {name} with code: {country_code}")
+    logger.info("Creating new country: %s with code: %s", name, country_code)
     
-    try:
-        country_data = Country.build_from_form(
+    # Single round trip: the unique constraints on slug and country_code
+    # reject duplicates instead of two pre-insert SELECTs
+    country_code = country_code.upper()
+    stmt = (
+        pg_insert(Country)
+        .values(
             name=name,
             slug=slug,
             country_code=country_code,
@@ -50,11 +90,23 @@ async def create_country(
             image_id=image_id,
             image_url=image_url,
         )
-
-        # Check if country already exists
-        existing = await Country.get_by_code(db, code=country_code)
-        if existing:
-            logger.warning(f"Attempt to create country with existing code: {country_code}")
+        .on_conflict_do_nothing()
+        .returning(Country)
+    )
+    country_data = (await db.execute(stmt)).scalar_one_or_none()
+    
+    if country_data is None:
+        # Conflict; look up which constraint was hit only on this error path
+        await db.rollback()
+        result = await db.execute(
+            select(Country.id, Country.country_code)
+            .where(or_(Country.country_code == country_code, Country.slug == slug))
+            .order_by((Country.country_code == country_code).desc())
+            .limit(1)
+        )
+        existing = result.one_or_none()
+        if existing is not None and existing.country_code == country_code:
+            logger.warning("Attempt to create country with existing code: %s", country_code)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -63,45 +115,25 @@ async def create_country(
                     "details": {"country_code": country_code, "existing_id": existing.id}
                 }
             )
-
-        # Check if slug already exists
-        result = await db.execute(select(Country).where(Country.slug == slug))
-        existing_slug = result.scalar_one_or_none()
-        if existing_slug:
-            logger.warning(f"Attempt to create country with existing slug: {slug}")
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": f"Country with slug '{slug}' already exists",
-                    "error_code": "COUNTRY_SLUG_EXISTS",
-                    "details": {"slug": slug, "existing_id": existing_slug.id}
-                }
-            )
-
-        # Create country using built object
-        db.add(country_data)
-        await db.commit()
-        await db.refresh(country_data)
-        
-        logger.info(f"Successfully created country: {name} with ID: {country_data.id}")
-        
-        return CountryOut.model_validate(country_data)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Error creating country {name}: {str(e)}")
+        logger.warning("Attempt to create country with existing slug: %s", slug)
         raise HTTPException(
-            status_code=500,
+            status_code=400,
             detail={
-                "message": "Failed to create country",
-                "error_code": "COUNTRY_CREATION_ERROR",
-                "details": {"error": str(e)}
+                "message": f"Country with slug '{slug}' already exists",
+                "error_code": "COUNTRY_SLUG_EXISTS",
+                "details": {"slug": slug, "existing_id": existing.id if existing else None}
             }
         )
+    
+    await db.commit()
+    await cache_service.clear("countries")
+    
+    logger.info("Successfully created country: %s with ID: %s", name, country_data.id)
+    
+    return CountryOut.model_validate(country_data)
 
 @router.get("/", response_model=CountryListResponse)
+@cache_service.cached(namespace="countries")
 async def get_countries(
     skip: int = 0,
     limit: int = 100,
@@ -122,56 +154,49 @@ async def get_countries(
     Returns:
         CountryListResponse: List of countries with pagination information
     """
-    logger.info(f"Fetching countries - skip: {skip}, limit: {limit}, showon_destmenu: {showon_destmenu}, search: {search}")
+    logger.info("Fetching countries - skip: %s, limit: %s, showon_destmenu: %s, search: %s", skip, limit, showon_destmenu, search)
     
-    try:
-        # Build query
-        query = select(Country)
-        count_query = select(func.count(Country.id))
-        
-        # Apply filters
-        if showon_destmenu is not None:
-            query = query.where(Country.showon_destmenu == showon_destmenu)
-            count_query = count_query.where(Country.showon_destmenu == showon_destmenu)
-            
-        if search:
-            search_filter = Country.name.ilike(f"%{search}%")
-            query = query.where(search_filter)
-            count_query = count_query.where(search_filter)
+    # Build query; the window column carries the filtered total on every
+    # row so the count and the page come back in one round trip
+    query = select(Country, func.count().over().label("total"))
+    
+    # Apply filters
+    filters = []
+    if showon_destmenu is not None:
+        filters.append(Country.showon_destmenu == showon_destmenu)
         
-        # Get total count
-        total_result = await db.execute(count_query)
+    if search:
+        filters.append(Country.name.ilike(f"%{search}%"))
+    
+    # Apply pagination and execute
+    query = query.where(*filters).offset(skip).limit(limit).order_by(Country.created_at.desc())
+    
+    # Stream rows in batches and convert each one as it arrives instead of
+    # materializing the whole ORM result list first. Items are plain dicts;
+    # the response is rendered directly with orjson, skipping FastAPI's
+    # response_model validation and jsonable_encoder pass
+    result = await db.stream(query.execution_options(yield_per=COUNTRY_STREAM_BATCH))
+    countries_data = []
+    total = 0
+    async for row in result:
+        total = row.total
+        countries_data.append(_country_row(row[0]))
+    
+    if not countries_data and (skip > 0 or limit == 0):
+        # An empty page (past the end, or limit=0) has no rows to carry the
+        # window total
+        total_result = await db.execute(select(func.count(Country.id)).where(*filters))
         total = total_result.scalar() or 0
-        
-        # Apply pagination and execute
-        query = query.offset(skip).limit(limit).order_by(Country.created_at.desc())
-        result = await db.execute(query)
-        countries = result.scalars().all()
-        
-        # Convert to CountryOut schemas
-        countries_data = [CountryOut.model_validate(country) for country in countries]
-        
-        logger.info(f"Successfully retrieved {len(countries)} countries")
-        
-        return CountryListResponse(
-            countries=countries_data,
-            total=total,
-            page=(skip // limit) + 1 if limit > 0 else 1,
-            limit=limit
-        )
-        
-    except Exception as e:
-        logger.error(f"Error fetching countries: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to retrieve countries",
-                "error_code": "DATABASE_ERROR",
-                "details": {"error": str(e)}
-            }
-        )
+    
+    return ORJSONResponse(content={
+        "countries": countries_data,
+        "total": total,
+        "page": (skip // limit) + 1 if limit > 0 else 1,
+        "limit": limit
+    })
 
 @router.get("/{country_id}", response_model=CountryOut)
+@cache_service.cached(namespace="countries")
 async def get_country(
     country_id: int,
     db: AsyncSession = Depends(get_db)
@@ -186,38 +211,18 @@ async def get_country(
     Returns:
         CountryOut: Country data
     """
-    logger.info(f"Fetching country with ID: {country_id}")
+    logger.info("Fetching country with ID: %s", country_id)
     
-    try:
-        result = await db.execute(select(Country).where(Country.id == country_id))
-        country = result.scalar_one_or_none()
-        
-        if not country:
-            logger.warning(f"Country with ID {country_id} not found")
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "message": "Country not found",
-                    "error_code": "COUNTRY_NOT_FOUND",
-                    "details": {"country_id": country_id}
-                }
-            )
-        
-        logger.info(f"Successfully retrieved country: {country.name}")
-        return CountryOut.model_validate(country)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching country {country_id}: {str(e)}")
+    country = await db.get(Country, country_id)
+    
+    if not country:
+        logger.warning("Country with ID %s not found", country_id)
         raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to retrieve country",
-                "error_code": "DATABASE_ERROR",
-                "details": {"error": str(e)}
-            }
+            status_code=404,
+            detail={**COUNTRY_NOT_FOUND, "details": {"country_id": country_id}}
         )
+    
+    return ORJSONResponse(content=_country_out(country).model_dump())
 
 @router.get("/slug/{slug}", response_model=CountryOut)
 async def get_country_by_slug(
@@ -234,38 +239,25 @@ async def get_country_by_slug(
     Returns:
         CountryOut: Country data
     """
-    logger.info(f"Fetching country with slug: {slug}")
+    logger.info("Fetching country with slug: %s", slug)
     
-    try:
-        result = await db.execute(select(Country).where(Country.slug == slug))
-        country = result.scalar_one_or_none()
-        
-        if not country:
-            logger.warning(f"Country with slug {slug} not found")
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "message": "Country not found",
-                    "error_code": "COUNTRY_NOT_FOUND",
-                    "details": {"slug": slug}
-                }
-            )
-        
-        logger.info(f"Successfully retrieved country: {country.name}")
-        return CountryOut.model_validate(country)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching country by slug {slug}: {str(e)}")
+    body = country_slug_cache.get(slug)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    
+    result = await db.execute(COUNTRY_BY_SLUG, {"slug": slug})
+    country = result.scalar_one_or_none()
+    
+    if not country:
+        logger.warning("Country with slug %s not found", slug)
         raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to retrieve country",
-                "error_code": "DATABASE_ERROR",
-                "details": {"error": str(e)}
-            }
+            status_code=404,
+            detail={**COUNTRY_NOT_FOUND, "details": {"slug": slug}}
         )
+    
+    body = orjson.dumps(_country_out(country).model_dump())
+    country_slug_cache.set(slug, body)
+    return Response(content=body, media_type="application/json")
 
 @router.put("/{country_id}", response_model=CountryOut)
 async def update_country(
@@ -284,47 +276,36 @@ async def update_country(
     Returns:
         CountryOut: Updated country data
     """
-    logger.info(f"Updating country with ID: {country_id}")
+    logger.info("Updating country with ID: %s", country_id)
     
-    try:
-        result = await db.execute(select(Country).where(Country.id == country_id))
-        country = result.scalar_one_or_none()
-        
-        if not country:
-            logger.warning(f"Country with ID {country_id} not found for update")
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "message": "Country not found",
-                    "error_code": "COUNTRY_NOT_FOUND",
-                    "details": {"country_id": country_id}
-                }
-            )
-        
-        # Update fields that are provided
-        update_data = country_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(country, field, value)
-        
-        await db.commit()
-        await db.refresh(country)
-        
-        logger.info(f"Successfully updated country: {country.name}")
-        return CountryOut.model_validate(country)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Error updating country {country_id}: {str(e)}")
+    update_data = country_update.model_dump(exclude_unset=True)
+    
+    if update_data:
+        # One UPDATE ... RETURNING instead of SELECT, flush and refresh
+        stmt = (
+            update(Country)
+            .where(Country.id == country_id)
+            .values(**update_data)
+            .returning(Country)
+            .execution_options(synchronize_session=False)
+        )
+        country = (await db.execute(stmt)).scalar_one_or_none()
+    else:
+        country = await db.get(Country, country_id)
+    
+    if not country:
+        logger.warning("Country with ID %s not found for update", country_id)
         raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to update country",
-                "error_code": "COUNTRY_UPDATE_ERROR",
-                "details": {"error": str(e)}
-            }
+            status_code=404,
+            detail={**COUNTRY_NOT_FOUND, "details": {"country_id": country_id}}
         )
+    
+    await db.commit()
+    await cache_service.clear("countries")
+    country_slug_cache.clear()
+    
+    logger.info("Successfully updated country: %s", country.name)
+    return CountryOut.model_validate(country)
 
 @router.delete("/{country_id}", status_code=204)
 async def delete_country(
@@ -341,39 +322,24 @@ async def delete_country(
     Returns:
         None: 204 No Content on successful deletion
     """
-    logger.info(f"Deleting country with ID: {country_id}")
+    logger.info("Deleting country with ID: %s", country_id)
     
-    try:
-        result = await db.execute(select(Country).where(Country.id == country_id))
-        country = result.scalar_one_or_none()
-        
-        if not country:
-            logger.warning(f"Country with ID {country_id} not found for deletion")
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "message": "Country not found",
-                    "error_code": "COUNTRY_NOT_FOUND",
-                    "details": {"country_id": country_id}
-                }
-            )
-        
-        await db.delete(country)
-        await db.commit()
-        
-        logger.info(f"Successfully deleted country: {country.name}")
-        return None
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Error deleting country {country_id}: {str(e)}")
+    # Single DELETE ... RETURNING; no ORM object is loaded first
+    result = await db.execute(
+        delete(Country).where(Country.id == country_id).returning(Country.id, Country.name)
+    )
+    country = result.one_or_none()
+    
+    if country is None:
+        logger.warning("Country with ID %s not found for deletion", country_id)
         raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to delete country",
-                "error_code": "COUNTRY_DELETION_ERROR",
-                "details": {"error": str(e)}
-            }
+            status_code=404,
+            detail={**COUNTRY_NOT_FOUND, "details": {"country_id": country_id}}
         )
+    
+    await db.commit()
+    await cache_service.clear("countries")
+    country_slug_cache.clear()
+    
+    logger.info("Successfully deleted country: %s", country.name)
+    return None
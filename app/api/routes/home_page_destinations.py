@@ -1,17 +1,46 @@
 from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile, File as FastAPIFile
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, delete, select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import Optional
 
+from app.core.responses import ORJSONResponse
 from app.db.sql import get_db
 from app.models.file import File
 from app.models.home_destination import HomePageDestinations
 from app.schemas.home_destination import HomeDestinationOut, HomeDestinationCreate, HomeDestinationUpdate, HomeDestinationListResponse
+from app.services.cache_service import cache_service
+from app.services.gcp_service import gcp_service
 import logging
 
 router = APIRouter()
 logger = logging.getLogger("api")
 
+# Static part of the 404 payload, shared by every lookup endpoint
+DESTINATION_NOT_FOUND = {"message": "Home destination not found", "error_code": "DESTINATION_NOT_FOUND"}
+
+# HomeDestinationOut fields, read straight off ORM rows; values are already
+# typed, so responses are built with model_construct instead of re-validating
+DESTINATION_OUT_FIELDS = tuple(HomeDestinationOut.model_fields)
+
+# Statements built once at import; handlers only bind parameters
+DESTINATION_ID_BY_ORDER = select(HomePageDestinations.id).where(HomePageDestinations.order == bindparam("order"))
+
+def _order_exists(order: int, existing_id: Optional[int]) -> HTTPException:
+    """Build the 400 raised when another destination already uses order"""
+    return HTTPException(
+        status_code=400,
+        detail={
+            "message": f"Home destination with order {order} already exists",
+            "error_code": "ORDER_EXISTS",
+            "details": {"order": order, "existing_id": existing_id}
+        }
+    )
+
+def _destination_out(destination: HomePageDestinations) -> HomeDestinationOut:
+    """Build a HomeDestinationOut from a loaded row without validation"""
+    return HomeDestinationOut.model_construct(**{field: getattr(destination, field) for field in DESTINATION_OUT_FIELDS})
+
 @router.post("/", response_model=HomeDestinationOut)
 async def create_home_destination(
     city: str = Form(...),
@@ -34,96 +63,89 @@ async def create_home_destination(
         HomeDestinationOut: Created destination data
     """
     
-    try:
-        # Validate order range
-        if not (1 <= order <= 999):
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": "Invalid order value",
-                    "error_code": "INVALID_ORDER",
-                    "details": {"order": order, "valid_range": "1-999"}
-                }
-            )
-        
-        # Check if order already exists
-        result_query = await db.execute(
-            select(HomePageDestinations).where(HomePageDestinations.order == order)
+    # Validate order range
+    if not (1 <= order <= 999):
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "Invalid order value",
+                "error_code": "INVALID_ORDER",
+                "details": {"order": order, "valid_range": "1-999"}
+            }
         )
-        existing = result_query.scalar_one_or_none()
-        
-        if existing:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": f"Home destination with order {order} already exists",
-                    "error_code": "ORDER_EXISTS",
-                    "details": {"order": order, "existing_id": existing.id}
-                }
-            )
-        
-        # Validate file
-        if not file or not file.filename:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": "Image file is required",
-                    "error_code": "FILE_REQUIRED",
-                    "details": {"file_provided": bool(file)}
-                }
-            )
-        
-        # Upload file and create file record
-        logger.info(f"Uploading file: {file.filename}")
-        try:
-            file_record = await File.build_by_field_storage_v2(file)
-            db.add(file_record)
-            await db.commit()
-            await db.refresh(file_record)
-            logger.info(f"File uploaded successfully: {file_record.public_url}")
-        except Exception as e:
-            await db.rollback()
-            logger.error(f"File upload failed: {str(e)}")
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "message": "Failed to upload image file",
-                    "error_code": "FILE_UPLOAD_ERROR",
-                    "details": {"error": str(e)}
-                }
-            )
-        
-        # Create home destination
-        destination = HomePageDestinations.build(
-            city=city,
-            order=order,
-            is_active=is_active,
-            image=file_record.id,
-            image_url=file_record.public_url,
+    
+    # Validate file
+    if not file or not file.filename:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "Image file is required",
+                "error_code": "FILE_REQUIRED",
+                "details": {"file_provided": bool(file)}
+            }
         )
-        
-        db.add(destination)
-        await db.commit()
-        await db.refresh(destination)
-        
-        logger.info(f"Home destination created successfully: ID {destination.id}")
-        return HomeDestinationOut.model_validate(destination)
-        
-    except HTTPException:
-        raise
+    
+    # Cheap id-only check so a taken order is rejected before anything is
+    # uploaded; the ON CONFLICT below still covers a concurrent insert
+    existing_id = (await db.execute(DESTINATION_ID_BY_ORDER, {"order": order})).scalar()
+    if existing_id is not None:
+        raise _order_exists(order, existing_id)
+    
+    # Upload file and create file record; flush assigns its id without
+    # committing, so the file row and the destination commit together
+    logger.info("Uploading file: %s", file.filename)
+    try:
+        file_record = await File.build_by_field_storage_v2(file)
+        db.add(file_record)
+        await db.flush()
+        logger.info("File uploaded successfully: %s", file_record.public_url)
     except Exception as e:
         await db.rollback()
-        logger.error(f"Failed to create home destination: {str(e)}")
+        logger.error("File upload failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail={
-                "message": "Failed to create home destination",
-                "error_code": "CREATION_ERROR",
+                "message": "Failed to upload image file",
+                "error_code": "FILE_UPLOAD_ERROR",
                 "details": {"error": str(e)}
             }
         )
+    
+    # Create home destination; the unique index on order rejects duplicates
+    # in the same statement instead of a separate existence SELECT
+    stmt = (
+        pg_insert(HomePageDestinations)
+        .values(
+            city=city,
+            order=order,
+            is_active=is_active,
+            image=file_record.id,
+            image_url=file_record.public_url,
+        )
+        .on_conflict_do_nothing(index_elements=[HomePageDestinations.order])
+        .returning(HomePageDestinations)
+    )
+    destination = (await db.execute(stmt)).scalar_one_or_none()
+    
+    if destination is None:
+        # Lost a race for this order. The rollback discards the file row
+        # flushed above; the uploaded object has to be removed separately
+        await db.rollback()
+        try:
+            await gcp_service.delete_file(file_record.blob_name)
+        except Exception as e:
+            logger.warning("Failed to delete orphaned upload %s: %s", file_record.blob_name, e)
+        existing_id = (await db.execute(DESTINATION_ID_BY_ORDER, {"order": order})).scalar()
+        raise _order_exists(order, existing_id)
+    
+    await db.commit()
+    await cache_service.clear("home_destinations")
+    
+    logger.info("Home destination created successfully: ID %s", destination.id)
+    return HomeDestinationOut.model_validate(destination)
 
 @router.get("/", response_model=HomeDestinationListResponse)
+@cache_service.cached(namespace="home_destinations")
 async def get_home_destinations(
     skip: int = 0,
     limit: int = 100,
@@ -145,53 +167,54 @@ async def get_home_destinations(
         HomeDestinationListResponse: List of destinations with pagination
     """
     
-    try:
-        # Build query
-        query = select(HomePageDestinations)
-        count_query = select(func.count(HomePageDestinations.id))
-        
-        # Apply filters
-        if active_only:
-            query = query.where(HomePageDestinations.is_active == True)
-            count_query = count_query.where(HomePageDestinations.is_active == True)
-            
-        if search:
-            search_filter = HomePageDestinations.city.ilike(f"%{search}%")
-            query = query.where(search_filter)
-            count_query = count_query.where(search_filter)
+    # Build query; the window column carries the filtered total on every
+    # row so the count and the page come back in one round trip
+    query = select(HomePageDestinations, func.count().over().label("total"))
+    
+    # Apply filters
+    filters = []
+    if active_only:
+        filters.append(HomePageDestinations.is_active == True)
         
-        # Get total count
-        total_result = await db.execute(count_query)
+    if search:
+        filters.append(HomePageDestinations.city.ilike(f"%{search}%"))
+    
+    # Apply pagination and execute
+    query = query.where(*filters).offset(skip).limit(limit).order_by(HomePageDestinations.order)
+    result_query = await db.execute(query)
+    rows = result_query.all()
+    destinations = [row[0] for row in rows]
+    
+    if rows:
+        total = rows[0].total
+    elif skip > 0 or limit == 0:
+        # An empty page (past the end, or limit=0) has no rows to carry the
+        # window total
+        total_result = await db.execute(select(func.count(HomePageDestinations.id)).where(*filters))
         total = total_result.scalar() or 0
-        
-        # Apply pagination and execute
-        query = query.offset(skip).limit(limit).order_by(HomePageDestinations.order)
-        result_query = await db.execute(query)
-        destinations = result_query.scalars().all()
-        
-        # Convert to schema objects
-        destinations_data = [HomeDestinationOut.model_validate(dest) for dest in destinations]
-        
-        logger.info(f"Retrieved {len(destinations)} home destinations")
-        
-        return HomeDestinationListResponse(
-            destinations=destinations_data,
-            total=total,
-            active_count=len([d for d in destinations_data if d.is_active])
-        )
-        
-    except Exception as e:
-        logger.error(f"Failed to retrieve home destinations: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to retrieve home destinations",
-                "error_code": "RETRIEVAL_ERROR",
-                "details": {"error": str(e)}
-            }
-        )
+    else:
+        total = 0
+    
+    # Convert to plain dicts; the response is rendered directly with orjson,
+    # skipping FastAPI's response_model validation and jsonable_encoder pass
+    destinations_data = [_destination_out(dest).model_dump() for dest in destinations]
+    
+    # With active_only every row on the page is active
+    if active_only:
+        active_count = len(destinations)
+    else:
+        active_count = sum(1 for dest in destinations if dest.is_active)
+    
+    logger.info("Retrieved %s home destinations", len(destinations))
+    
+    return ORJSONResponse(content={
+        "destinations": destinations_data,
+        "total": total,
+        "active_count": active_count
+    })
 
 @router.get("/{destination_id}", response_model=HomeDestinationOut)
+@cache_service.cached(namespace="home_destinations")
 async def get_home_destination(
     destination_id: int,
     db: AsyncSession = Depends(get_db)
@@ -207,37 +230,16 @@ async def get_home_destination(
         HomeDestinationOut: Destination data
     """
     
-    try:
-        result_query = await db.execute(
-            select(HomePageDestinations).where(HomePageDestinations.id == destination_id)
-        )
-        destination = result_query.scalar_one_or_none()
-        
-        if not destination:
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "message": "Home destination not found",
-                    "error_code": "DESTINATION_NOT_FOUND",
-                    "details": {"destination_id": destination_id}
-                }
-            )
-        
-        logger.info(f"Retrieved home destination: ID {destination.id}")
-        return HomeDestinationOut.model_validate(destination)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to retrieve home destination {destination_id}: {str(e)}")
+    destination = await db.get(HomePageDestinations, destination_id)
+    
+    if not destination:
         raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to retrieve home destination",
-                "error_code": "RETRIEVAL_ERROR",
-                "details": {"destination_id": destination_id, "error": str(e)}
-            }
+            status_code=404,
+            detail={**DESTINATION_NOT_FOUND, "details": {"destination_id": destination_id}}
         )
+    
+    logger.info("Retrieved home destination: ID %s", destination.id)
+    return ORJSONResponse(content=_destination_out(destination).model_dump())
 
 @router.put("/{destination_id}", response_model=HomeDestinationOut)
 async def update_home_destination(
@@ -262,97 +264,75 @@ async def update_home_destination(
     Returns:
         HomeDestinationOut: Updated home destination data
     """
-    logger.info(f"Updating home destination with ID: {destination_id}")
+    logger.info("Updating home destination with ID: %s", destination_id)
     
-    try:
-        # Check if destination exists
-        result_query = await db.execute(select(HomePageDestinations).where(HomePageDestinations.id == destination_id))
-        destination = result_query.scalar_one_or_none()
-        
-        if not destination:
-            logger.warning(f"Home destination with ID {destination_id} not found")
+    # Check if destination exists
+    destination = await db.get(HomePageDestinations, destination_id)
+    
+    if not destination:
+        logger.warning("Home destination with ID %s not found", destination_id)
+        raise HTTPException(
+            status_code=404,
+            detail={**DESTINATION_NOT_FOUND, "details": {"destination_id": destination_id}}
+        )
+    
+    # Check if order is being changed and if it would conflict
+    if order is not None and order != destination.order:
+        # The destination itself still holds its old order, so any match is another row
+        existing_id = (await db.execute(DESTINATION_ID_BY_ORDER, {"order": order})).scalar()
+        if existing_id is not None:
+            logger.warning("Attempt to update destination with existing order: %s", order)
             raise HTTPException(
-                status_code=404,
+                status_code=400,
                 detail={
-                    "message": "Home destination not found",
-                    "error_code": "DESTINATION_NOT_FOUND",
-                    "details": {"destination_id": destination_id}
+                    "message": f"Another destination with order {order} already exists",
+                    "error_code": "ORDER_CONFLICT",
+                    "details": {"order": order, "existing_id": existing_id}
                 }
             )
-        
-        # Check if order is being changed and if it would conflict
-        if order is not None and order != destination.order:
-            result_query = await db.execute(select(HomePageDestinations).where(
-                HomePageDestinations.order == order,
-                HomePageDestinations.id != destination_id
-            ))
-            existing = result_query.scalar_one_or_none()
-            if existing:
-                logger.warning(f"Attempt to update destination with existing order: {order}")
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "message": f"Another destination with order {order} already exists",
-                        "error_code": "ORDER_CONFLICT",
-                        "details": {"order": order, "existing_id": existing.id}
-                    }
-                )
-        
-        # Handle file upload if provided
-        image_id = None
-        if file and file.filename:
-            try:
-                # Upload file and get file record
-                uploaded_file = await File.build_by_field_storage_v2(file)
-                if uploaded_file:
-                    image_id = uploaded_file.id
-                    logger.info(f"New image uploaded with ID: {image_id}")
-            except Exception as upload_error:
-                logger.error(f"Error uploading image: {str(upload_error)}")
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "message": "Failed to upload image",
-                        "error_code": "IMAGE_UPLOAD_ERROR",
-                        "details": {"error": str(upload_error)}
-                    }
-                )
-        
-        # Prepare update data
-        update_data = {}
-        if city is not None:
-            update_data['city'] = city.lower()  # Normalize city name
-        if order is not None:
-            update_data['order'] = order
-        if is_active is not None:
-            update_data['is_active'] = is_active
-        if image_id is not None:
-            update_data['image'] = image_id
-        
-        # Update fields manually since HomePageDestinations doesn't have update method
-        for field, value in update_data.items():
-            setattr(destination, field, value)
-        
-        db.add(destination)
-        await db.commit()
-        await db.refresh(destination)
-        
-        logger.info(f"Home destination {destination_id} updated successfully")
-        return HomeDestinationOut.model_validate(destination)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Error updating destination {destination_id}: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to update home destination",
-                "error_code": "UPDATE_ERROR",
-                "details": {"error": str(e)}
-            }
-        )
+    
+    # Handle file upload if provided
+    image_id = None
+    if file and file.filename:
+        try:
+            # Upload file and get file record
+            uploaded_file = await File.build_by_field_storage_v2(file)
+            if uploaded_file:
+                image_id = uploaded_file.id
+                logger.info("New image uploaded with ID: %s", image_id)
+        except Exception as upload_error:
+            logger.error("Error uploading image: %s", upload_error)
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "message": "Failed to upload image",
+                    "error_code": "IMAGE_UPLOAD_ERROR",
+                    "details": {"error": str(upload_error)}
+                }
+            )
+    
+    # Prepare update data
+    update_data = {}
+    if city is not None:
+        update_data['city'] = city.lower()  # Normalize city name
+    if order is not None:
+        update_data['order'] = order
+    if is_active is not None:
+        update_data['is_active'] = is_active
+    if image_id is not None:
+        update_data['image'] = image_id
+    
+    # Update fields manually since HomePageDestinations doesn't have update method
+    for field, value in update_data.items():
+        setattr(destination, field, value)
+    
+    db.add(destination)
+    await db.commit()
+    await db.refresh(destination)
+    await cache_service.clear("home_destinations")
+    
+    logger.info("Home destination %s updated successfully", destination_id)
+    return HomeDestinationOut.model_validate(destination)
 
 @router.delete("/{destination_id}")
 async def delete_home_destination(
@@ -370,44 +350,26 @@ async def delete_home_destination(
         dict: Success message
     """
     
-    try:
-        # Get existing destination
-        result_query = await db.execute(
-            select(HomePageDestinations).where(HomePageDestinations.id == destination_id)
-        )
-        destination = result_query.scalar_one_or_none()
-        
-        if not destination:
-            raise HTTPException(
-                status_code=404,
-                detail={
-                    "message": "Home destination not found",
-                    "error_code": "DESTINATION_NOT_FOUND",
-                    "details": {"destination_id": destination_id}
-                }
-            )
-        
-        # Delete the destination
-        await db.delete(destination)
-        await db.commit()
-        
-        logger.info(f"Home destination {destination_id} deleted successfully")
-        
-        return {
-            "message": "Home destination deleted successfully",
-            "destination_id": destination_id
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to delete home destination {destination_id}: {str(e)}")
+    # Single DELETE ... RETURNING; no ORM object is loaded first
+    result_query = await db.execute(
+        delete(HomePageDestinations)
+        .where(HomePageDestinations.id == destination_id)
+        .returning(HomePageDestinations.id)
+    )
+    deleted_id = result_query.scalar_one_or_none()
+    
+    if deleted_id is None:
         raise HTTPException(
-            status_code=500,
-            detail={
-                "message": "Failed to delete home destination",
-                "error_code": "DELETE_ERROR",
-                "details": {"destination_id": destination_id, "error": str(e)}
-            }
-        )
\ No newline at end of file
+            status_code=404,
+            detail={**DESTINATION_NOT_FOUND, "details": {"destination_id": destination_id}}
+        )
+    
+    await db.commit()
+    await cache_service.clear("home_destinations")
+    
+    logger.info("Home destination %s deleted successfully", destination_id)
+    
+    return {
+        "message": "Home destination deleted successfully",
+        "destination_id": destination_id
+    }
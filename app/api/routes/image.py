@@ -1,33 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File as FastAPIFile
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File as FastAPIFile
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import insert, select, func, tuple_, update
 from typing import Optional, List
 
 from app.db.sql import get_db
 from app.models.file import File 
 from app.models.image import Image 
 from app.schemas.image import ImageOut, ImageCreate, ImageUpdate, ImageUploadResponse, ImageListResponse
+from app.utility.utils import decode_cursor, encode_cursor
 
 router = APIRouter()
 
+# ImageUpdate also carries fields with no backing column (alt_text,
+# is_active); only real columns can go into an UPDATE statement
+IMAGE_COLUMNS = frozenset(Image.__table__.columns.keys())
+
+# Columns backing ImageOut, selected directly on the list endpoint to skip ORM
+# hydration; the fields without a column keep their schema defaults
+IMAGE_OUT_COLUMNS = tuple(getattr(Image, field) for field in ImageOut.model_fields if field in IMAGE_COLUMNS)
+
+# Validates a whole page of rows in one call
+IMAGE_LIST_ADAPTER = TypeAdapter(List[ImageOut])
+
 @router.post("/upload", response_model=ImageUploadResponse)
 async def upload_image(
     file: UploadFile = FastAPIFile(...),
     description: Optional[str] = None,
     alt_text: Optional[str] = None,
-    order: Optional[int] = None,
+    order: Optional[int] = Query(None, ge=0, le=9999, description="Display order"),
     db: AsyncSession = Depends(get_db)
 ):
   
     try:
-        # Create file record
+        # Create file record; flush assigns its id without ending the transaction
         file_record = await File.build_by_field_storage_v2(file)
         db.add(file_record)
-        await db.commit()
-        await db.refresh(file_record)
+        await db.flush()
         
         # Create image record using build method
-        image = Image.build_from_form(
+        image = Image.build(
             filename=getattr(file_record, 'filename', 'unknown') or "unknown",
             image_url=getattr(file_record, 'public_url', '') or "",
             backup_image_url=getattr(file_record, 'public_url', None),
@@ -35,9 +47,25 @@ async def upload_image(
             order=order or 0,
             file_id=getattr(file_record, 'id', None),
         )
-        db.add(image)
+        
+        # INSERT ... RETURNING hands back id and created_at without a refresh
+        result = await db.execute(
+            insert(Image)
+            .values(
+                filename=image.filename,
+                image_url=image.image_url,
+                backup_image_url=image.backup_image_url,
+                premier_image_url=image.premier_image_url,
+                description=image.description,
+                order=image.order,
+                file_id=image.file_id,
+            )
+            .returning(Image)
+        )
+        image = result.scalar_one()
+        
+        # File and image rows are committed together
         await db.commit()
-        await db.refresh(image)
         
         # Return structured upload response
         return ImageUploadResponse(
@@ -57,47 +85,89 @@ async def get_images(
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True,
+    after: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all images with pagination
     
+    Passing the next_cursor of a previous page as after switches to keyset
+    pagination: the page is read with WHERE (order, id) > cursor instead of
+    OFFSET, so deep pages cost the same as the first. skip is ignored and the
+    total is not computed in that mode.
+    
     Args:
         skip: Number of records to skip
         limit: Maximum number of records to return
         active_only: Whether to return only non-deleted images
+        after: Cursor from a previous page
         db: Async database session
         
     Returns:
         ImageListResponse: List of images with pagination
     """
+    cursor = None
+    if after is not None:
+        values = decode_cursor(after, 2)
+        try:
+            # order may be negative, so parse rather than check isdigit()
+            cursor = tuple(int(value) for value in values) if values else None
+        except ValueError:
+            cursor = None
+        if cursor is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+    
     try:
-        # Build query
-        query = select(Image)
-        count_query = select(func.count(Image.id))
-        
+        filters = []
         if active_only:
-            query = query.where(Image.is_deleted == False)
-            count_query = count_query.where(Image.is_deleted == False)
-        
-        # Get total count
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
+            filters.append(Image.is_deleted == False)
         
-        # Apply pagination
-        query = query.offset(skip).limit(limit).order_by(Image.order, Image.id)
+        if cursor is not None:
+            # Keyset page: an index range scan from the cursor, no count
+            query = (
+                select(*IMAGE_OUT_COLUMNS)
+                .where(*filters, tuple_(Image.order, Image.id) > cursor)
+                .order_by(Image.order, Image.id)
+                .limit(limit)
+            )
+            rows = (await db.execute(query)).mappings().all()
+            total = None
+        else:
+            # Build query; the window column carries the filtered total on every
+            # row so the count and the page come back in one round trip
+            query = select(*IMAGE_OUT_COLUMNS, func.count().over().label("total"))
+            
+            # Apply pagination
+            query = query.where(*filters).offset(skip).limit(limit).order_by(Image.order, Image.id)
+            
+            rows = (await db.execute(query)).mappings().all()
+            total = rows[0]["total"] if rows else 0
+            
+            if not rows and (skip > 0 or limit == 0):
+                # An empty page (past the end, or limit=0) has no rows to carry the
+                # window total
+                total_result = await db.execute(select(func.count(Image.id)).where(*filters))
+                total = total_result.scalar() or 0
         
-        result = await db.execute(query)
-        images = result.scalars().all()
+        # Convert plain column rows to ImageOut schemas (the extra "total"
+        # key is ignored)
+        images_data = IMAGE_LIST_ADAPTER.validate_python(rows)
         
-        # Convert to ImageOut schemas
-        images_data = [ImageOut.model_validate(image) for image in images]
+        # A full page may have more after it; rows without an order can't be
+        # used as a seek position, so the cursor stops there
+        next_cursor = None
+        if limit > 0 and len(rows) == limit and rows[-1]["order"] is not None:
+            next_cursor = encode_cursor(rows[-1]["order"], rows[-1]["id"])
         
         return ImageListResponse(
             images=images_data,
             total=total,
-            page=(skip // limit) + 1 if limit > 0 else 1,
-            limit=limit
+            page=(skip // limit) + 1 if limit > 0 and cursor is None else 1,
+            limit=limit,
+            next_cursor=next_cursor
         )
         
     except Exception as e:
@@ -165,8 +235,24 @@ async def update_image(
         HTTPException: If image not found or update fails
     """
     try:
-        result = await db.execute(select(Image).where(Image.id == image_id))
-        image = result.scalar_one_or_none()
+        update_data = {
+            field: value
+            for field, value in image_update.model_dump(exclude_unset=True).items()
+            if field in IMAGE_COLUMNS
+        }
+        
+        if update_data:
+            # One UPDATE ... RETURNING instead of SELECT, flush and refresh
+            stmt = (
+                update(Image)
+                .where(Image.id == image_id)
+                .values(**update_data)
+                .returning(Image)
+                .execution_options(synchronize_session=False)
+            )
+            image = (await db.execute(stmt)).scalar_one_or_none()
+        else:
+            image = await db.get(Image, image_id)
         
         if not image:
             raise HTTPException(
@@ -174,13 +260,7 @@ async def update_image(
                 detail="Image not found"
             )
         
-        # Update fields that are provided
-        update_data = image_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(image, field, value)
-        
         await db.commit()
-        await db.refresh(image)
         
         return ImageOut.model_validate(image)
         
@@ -209,18 +289,20 @@ async def delete_image(
         HTTPException: If image not found
     """
     try:
-        result = await db.execute(select(Image).where(Image.id == image_id))
-        image = result.scalar_one_or_none()
+        # Soft delete in a single UPDATE ... RETURNING
+        result = await db.execute(
+            update(Image)
+            .where(Image.id == image_id)
+            .values(is_deleted=True)
+            .returning(Image.id)
+        )
         
-        if not image:
+        if result.scalar_one_or_none() is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Image not found"
             )
         
-        # Soft delete
-        setattr(image, 'is_deleted', True)
-        db.add(image)
         await db.commit()
         
         return None
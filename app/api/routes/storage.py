@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File as FastAPIFile
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Any, Awaitable, Callable, List, Optional
+import asyncio
 import uuid
 
 from app.db.sql import get_db
@@ -10,6 +11,55 @@ from app.services.gcp_service import gcp_service
 
 router = APIRouter()
 
+# Bulk uploads: files per request, and provider uploads in flight at once
+MAX_BULK_FILES = 50
+BULK_UPLOAD_CONCURRENCY = 16
+
+# Content types accepted by every upload endpoint
+ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/gif", "image/webp"})
+
+def _check_bulk_files(files: List[UploadFile]):
+    """Reject a bulk request up front if it is too large or has a disallowed type"""
+    if len(files) > MAX_BULK_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_FILES} files can be uploaded at once"
+        )
+    
+    rejected = [file.filename for file in files if file.content_type not in ALLOWED_IMAGE_TYPES]
+    if rejected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Only JPEG, PNG, GIF, or WebP images are allowed: {', '.join(rejected)}"
+        )
+
+async def _gather_limited(upload: Callable[[UploadFile], Awaitable[Any]], files: List[UploadFile]) -> list:
+    """
+    Run upload for every file with at most BULK_UPLOAD_CONCURRENCY in flight
+    
+    Args:
+        upload: Coroutine function handling a single file
+        files: Files to upload
+        
+    Returns:
+        list: Result or raised exception for each file, in order
+    """
+    semaphore = asyncio.Semaphore(BULK_UPLOAD_CONCURRENCY)
+    
+    async def run(file: UploadFile):
+        async with semaphore:
+            return await upload(file)
+    
+    return await asyncio.gather(*(run(file) for file in files), return_exceptions=True)
+
+def _failures(files: List[UploadFile], results: list) -> List[dict]:
+    """Per-file error entries for the results that are exceptions"""
+    return [
+        {"filename": file.filename, "error": getattr(result, "detail", None) or str(result)}
+        for file, result in zip(files, results)
+        if isinstance(result, Exception)
+    ]
+
 @router.post("/upload/gcp", status_code=status.HTTP_201_CREATED)
 async def upload_file_to_gcp(
     file: UploadFile = FastAPIFile(...),
@@ -28,9 +78,7 @@ async def upload_file_to_gcp(
     Raises:
         HTTPException: If file type not allowed or upload fails
     """
-    allowed_types = ["image/jpeg", "image/png", "image/gif", "image/webp"]
-    
-    if file.content_type not in allowed_types:
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail="Only JPEG, PNG, GIF, or WebP images are allowed"
@@ -78,9 +126,7 @@ async def create_file_record(
     Raises:
         HTTPException: If file type not allowed or upload fails
     """
-    allowed_types = ["image/jpeg", "image/png", "image/gif", "image/webp"]
-
-    if file.content_type not in allowed_types:
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only JPEG, PNG, GIF, or WebP images are allowed"
@@ -128,9 +174,7 @@ async def upload_file_to_aws(
     Raises:
         HTTPException: If file type not allowed or upload fails
     """
-    allowed_types = ["image/jpeg", "image/png", "image/gif", "image/webp"]
-    
-    if file.content_type not in allowed_types:
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only JPEG, PNG, GIF, or WebP images are allowed"
@@ -141,7 +185,7 @@ async def upload_file_to_aws(
         filename = f"{uuid.uuid4().hex}_{file.filename}"
 
         # Upload to AWS S3
-        result = aws_service.upload_file(
+        result = await aws_service.upload_file(
             file_obj=file.file,
             object_name=filename,
             content_type=file.content_type
@@ -164,3 +208,114 @@ async def upload_file_to_aws(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Upload failed: {str(e)}"
         )
+
+@router.post("/upload/bulk", status_code=status.HTTP_201_CREATED)
+async def upload_files_to_gcp(
+    files: List[UploadFile] = FastAPIFile(...),
+):
+    """
+    Upload several files to Google Cloud Storage in parallel
+    
+    Uploads run concurrently, bounded by BULK_UPLOAD_CONCURRENCY, so the
+    request takes roughly as long as the slowest few uploads rather than the
+    sum of all of them.
+    
+    Args:
+        files: Files to upload
+        
+    Returns:
+        Uploaded files and per-file failures
+        
+    Raises:
+        HTTPException: If too many files, a file type not allowed, or every upload fails
+    """
+    _check_bulk_files(files)
+    
+    async def upload_one(file: UploadFile) -> dict:
+        filename = f"{uuid.uuid4().hex}_{file.filename}"
+        result = await gcp_service.upload_file(
+            file_obj=file.file,
+            object_name=filename,
+            content_type=file.content_type
+        )
+        return {
+            "filename": filename,
+            "url": result.get("public_url"),
+            "blob_name": result.get("blob_name")
+        }
+    
+    results = await _gather_limited(upload_one, files)
+    uploaded = [result for result in results if not isinstance(result, Exception)]
+    failed = _failures(files, results)
+    
+    if not uploaded:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Upload failed: {failed[0]['error'] if failed else 'no files provided'}"
+        )
+    
+    return {
+        "message": f"Uploaded {len(uploaded)} of {len(files)} files to GCP",
+        "files": uploaded,
+        "failed": failed
+    }
+
+@router.post("/upload/bulk/file-record", status_code=status.HTTP_201_CREATED)
+async def create_file_records(
+    files: List[UploadFile] = FastAPIFile(...),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload several files in parallel and create their database records
+    
+    The File rows are inserted together with add_all and a single commit
+    instead of one commit per file.
+    
+    Args:
+        files: Files to upload
+        db: Async database session
+        
+    Returns:
+        Created file records and per-file failures
+        
+    Raises:
+        HTTPException: If too many files, a file type not allowed, or every upload fails
+    """
+    _check_bulk_files(files)
+    
+    results = await _gather_limited(File.build_by_field_storage_v2, files)
+    file_objs = [result for result in results if not isinstance(result, Exception)]
+    failed = _failures(files, results)
+    
+    if not file_objs:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"File upload failed: {failed[0]['error'] if failed else 'no files provided'}"
+        )
+    
+    try:
+        # One flush inserts every row (batched with RETURNING for the ids)
+        db.add_all(file_objs)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"File upload failed: {str(e)}"
+        )
+    
+    return {
+        "message": f"Uploaded {len(file_objs)} of {len(files)} files and created their records",
+        "files": [
+            {
+                "file_id": file_obj.id,
+                "filename": file_obj.filename,
+                "identifier": file_obj.identifier,
+                "public_url": file_obj.public_url,
+                "blob_name": file_obj.blob_name,
+                "size": file_obj.size
+            }
+            for file_obj in file_objs
+        ],
+        "failed": failed
+    }
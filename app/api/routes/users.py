@@ -1,78 +1,131 @@
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import insert, or_, select, func, tuple_, update
 from typing import Optional, List
+from datetime import datetime
 
 from app.db.sql import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserOut, UserUpdate, UserListResponse
+from app.core.deps import current_user_cache
 from app.core.security import get_password_hash
+from app.utility.utils import decode_cursor, encode_cursor
 import logging
 
 router = APIRouter()
 logger = logging.getLogger("api")
 
+# Columns backing UserOut; list pages select only these, never hashed_password
+USER_OUT_COLUMNS = tuple(getattr(User, field) for field in UserOut.model_fields)
+
+# Built once; validates a page of user rows in a single call
+USER_LIST_ADAPTER = TypeAdapter(List[UserOut])
+
 @router.get("/", response_model=UserListResponse)
 async def get_users(
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
     is_active: Optional[bool] = None,
+    after: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get all users with optional filtering and pagination
     
+    Passing the next_cursor of a previous page as after switches to keyset
+    pagination on (created_at, id) instead of OFFSET; skip is ignored and the
+    total is not computed in that mode.
+    
     Args:
         skip: Number of records to skip
         limit: Maximum number of records to return
         search: Search term for username or email
         is_active: Filter by active status
+        after: Cursor from a previous page
         db: Async database session
         
     Returns:
         UserListResponse: List of users with pagination information
     """
-    logger.info(f"Fetching users - skip: {skip}, limit: {limit}, search: {search}, is_active: {is_active}")
+    logger.info("Fetching users - skip: %s, limit: %s, search: %s, is_active: %s, after: %s", skip, limit, search, is_active, after)
+    
+    cursor = None
+    if after is not None:
+        values = decode_cursor(after, 2)
+        try:
+            cursor = (datetime.fromisoformat(values[0]), int(values[1])) if values else None
+        except ValueError:
+            cursor = None
+        if cursor is None:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "message": "Invalid pagination cursor",
+                    "error_code": "INVALID_CURSOR",
+                    "details": {"after": after}
+                }
+            )
     
     try:
-        # Build query
-        query = select(User)
-        count_query = select(func.count(User.id))
-        
         # Apply filters
+        filters = []
         if search:
-            search_filter = User.username.ilike(f"%{search}%") | User.email.ilike(f"%{search}%")
-            query = query.where(search_filter)
-            count_query = count_query.where(search_filter)
+            filters.append(User.username.ilike(f"%{search}%") | User.email.ilike(f"%{search}%"))
             
         if is_active is not None:
-            query = query.where(User.is_active == is_active)
-            count_query = count_query.where(User.is_active == is_active)
+            filters.append(User.is_active == is_active)
         
-        # Get total count
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
+        order_by = (User.created_at.desc(), User.id.desc())
         
-        # Apply pagination and execute
-        query = query.offset(skip).limit(limit).order_by(User.created_at.desc())
-        result = await db.execute(query)
-        users = result.scalars().all()
+        if cursor is not None:
+            # Keyset page: an index range scan from the cursor, no count
+            query = (
+                select(*USER_OUT_COLUMNS)
+                .where(*filters, tuple_(User.created_at, User.id) < cursor)
+                .order_by(*order_by)
+                .limit(limit)
+            )
+            rows = (await db.execute(query)).mappings().all()
+            total = None
+        else:
+            # Build query; the window column carries the filtered total on every
+            # row so the count and the page come back in one round trip
+            query = select(*USER_OUT_COLUMNS, func.count().over().label("total"))
+            
+            # Apply pagination and execute
+            query = query.where(*filters).offset(skip).limit(limit).order_by(*order_by)
+            rows = (await db.execute(query)).mappings().all()
+            total = rows[0]["total"] if rows else 0
+            
+            if not rows and (skip > 0 or limit == 0):
+                # An empty page (past the end, or limit=0) has no rows to carry the
+                # window total
+                total_result = await db.execute(select(func.count(User.id)).where(*filters))
+                total = total_result.scalar() or 0
         
         # Convert to UserOut schemas
-        users_data = [UserOut.model_validate(user) for user in users]
+        users_data = USER_LIST_ADAPTER.validate_python(rows)
         
-        logger.info(f"Successfully retrieved {len(users)} users")
+        # A full page may have more after it
+        next_cursor = None
+        if limit > 0 and len(rows) == limit and rows[-1]["created_at"] is not None:
+            next_cursor = encode_cursor(rows[-1]["created_at"].isoformat(), rows[-1]["id"])
+        
+        logger.info("Successfully retrieved %s users", len(users_data))
         
         return UserListResponse(
             users=users_data,
             total=total,
-            page=(skip // limit) + 1 if limit > 0 else 1,
-            limit=limit
+            page=(skip // limit) + 1 if limit > 0 and cursor is None else 1,
+            limit=limit,
+            next_cursor=next_cursor
         )
         
     except Exception as e:
-        logger.error(f"Error fetching users: {str(e)}")
+        logger.error("Error fetching users: %s", e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -97,15 +150,23 @@ async def create_user(
     Returns:
         UserOut: Created user information
     """
-    logger.info(f"Creating new user with email: {user_in.email}")
+    logger.info("Creating new user with email: %s", user_in.email)
     
     try:
-        # Check if email already exists
+        # Check email and username uniqueness in one round trip; the query
+        # returns just two flags (NULL when nothing matches), never user rows
         result = await db.execute(
-            select(User).where(User.email == user_in.email)
+            select(
+                func.bool_or(User.email == user_in.email),
+                func.bool_or(User.username == user_in.username),
+            ).where(
+                or_(User.email == user_in.email, User.username == user_in.username)
+            )
         )
-        if result.scalar_one_or_none():
-            logger.warning(f"Attempt to create user with existing email: {user_in.email}")
+        email_taken, username_taken = result.one()
+        
+        if email_taken:
+            logger.warning("Attempt to create user with existing email: %s", user_in.email)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -115,12 +176,8 @@ async def create_user(
                 }
             )
         
-        # Check if username already exists
-        result = await db.execute(
-            select(User).where(User.username == user_in.username)
-        )
-        if result.scalar_one_or_none():
-            logger.warning(f"Attempt to create user with existing username: {user_in.username}")
+        if username_taken:
+            logger.warning("Attempt to create user with existing username: %s", user_in.username)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -130,19 +187,26 @@ async def create_user(
                 }
             )
         
-        # Create new user using build method
-        user = User.build_from_form(
-            email=user_in.email,
-            username=user_in.username,
-            hashed_password=get_password_hash(user_in.password),
-            is_active=user_in.is_active,
-            is_superuser=user_in.is_superuser,
+        # bcrypt takes hundreds of ms; hash in a worker thread so the event
+        # loop keeps serving other requests
+        hashed_password = await run_in_threadpool(get_password_hash, user_in.password)
+        
+        # INSERT ... RETURNING hands back id and created_at without a refresh
+        result = await db.execute(
+            insert(User)
+            .values(
+                email=user_in.email,
+                username=user_in.username,
+                hashed_password=hashed_password,
+                is_active=user_in.is_active,
+                is_superuser=user_in.is_superuser,
+            )
+            .returning(User)
         )
-        db.add(user)
+        user = result.scalar_one()
         await db.commit()
-        await db.refresh(user)
         
-        logger.info(f"Successfully created user with ID: {user.id}")
+        logger.info("Successfully created user with ID: %s", user.id)
         
         return UserOut.model_validate(user)
         
@@ -150,7 +214,7 @@ async def create_user(
         raise
     except Exception as e:
         await db.rollback()
-        logger.error(f"Error creating user: {str(e)}")
+        logger.error("Error creating user: %s", e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -175,14 +239,14 @@ async def read_user(
     Returns:
         UserOut: User data
     """
-    logger.info(f"Fetching user with ID: {user_id}")
+    logger.info("Fetching user with ID: %s", user_id)
     
     try:
         result = await db.execute(select(User).where(User.id == user_id))
         user = result.scalar_one_or_none()
         
         if not user:
-            logger.warning(f"User with ID {user_id} not found")
+            logger.warning("User with ID %s not found", user_id)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -192,13 +256,13 @@ async def read_user(
                 }
             )
         
-        logger.info(f"Successfully retrieved user: {user.username}")
+        logger.info("Successfully retrieved user: %s", user.username)
         return UserOut.model_validate(user)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching user {user_id}: {str(e)}")
+        logger.error("Error fetching user %s: %s", user_id, e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -225,14 +289,31 @@ async def update_user(
     Returns:
         UserOut: Updated user data
     """
-    logger.info(f"Updating user with ID: {user_id}")
+    logger.info("Updating user with ID: %s", user_id)
     
     try:
-        result = await db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+        # Update fields that are provided
+        update_data = user_update.model_dump(exclude_unset=True)
+        
+        # Handle password update
+        if 'password' in update_data:
+            update_data['hashed_password'] = await run_in_threadpool(get_password_hash, update_data.pop('password'))
+        
+        if update_data:
+            # One UPDATE ... RETURNING instead of SELECT, flush and refresh
+            stmt = (
+                update(User)
+                .where(User.id == user_id)
+                .values(**update_data)
+                .returning(User)
+                .execution_options(synchronize_session=False)
+            )
+            user = (await db.execute(stmt)).scalar_one_or_none()
+        else:
+            user = await db.get(User, user_id)
         
         if not user:
-            logger.warning(f"User with ID {user_id} not found for update")
+            logger.warning("User with ID %s not found for update", user_id)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -242,27 +323,17 @@ async def update_user(
                 }
             )
         
-        # Update fields that are provided
-        update_data = user_update.model_dump(exclude_unset=True)
-        
-        # Handle password update
-        if 'password' in update_data:
-            update_data['hashed_password'] = get_password_hash(update_data.pop('password'))
-        
-        for field, value in update_data.items():
-            setattr(user, field, value)
-        
         await db.commit()
-        await db.refresh(user)
+        current_user_cache.invalidate(user_id)
         
-        logger.info(f"Successfully updated user: {user.username}")
+        logger.info("Successfully updated user: %s", user.username)
         return UserOut.model_validate(user)
         
     except HTTPException:
         raise
     except Exception as e:
         await db.rollback()
-        logger.error(f"Error updating user {user_id}: {str(e)}")
+        logger.error("Error updating user %s: %s", user_id, e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -287,14 +358,14 @@ async def delete_user(
     Returns:
         None: 204 No Content on successful deletion
     """
-    logger.info(f"Deleting user with ID: {user_id}")
+    logger.info("Deleting user with ID: %s", user_id)
     
     try:
         result = await db.execute(select(User).where(User.id == user_id))
         user = result.scalar_one_or_none()
         
         if not user:
-            logger.warning(f"User with ID {user_id} not found for deletion")
+            logger.warning("User with ID %s not found for deletion", user_id)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -306,15 +377,16 @@ async def delete_user(
         
         await db.delete(user)
         await db.commit()
+        current_user_cache.invalidate(user_id)
         
-        logger.info(f"Successfully deleted user: {user.username}")
+        logger.info("Successfully deleted user: %s", user.username)
         return None
         
     except HTTPException:
         raise
     except Exception as e:
         await db.rollback()
-        logger.error(f"Error deleting user {user_id}: {str(e)}")
+        logger.error("Error deleting user %s: %s", user_id, e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -1,18 +1,26 @@
 from typing import Annotated, AsyncGenerator
 
 from fastapi import Depends, HTTPException, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_token_payload
 from app.db.sql import get_db
 from app.models.user import User
-from app.schemas.user import TokenPayload
+from app.schemas.user import AuthenticatedUser, TokenPayload
+from app.services.cache_service import LocalCache
+
+# Authenticated users by id, so protected endpoints don't SELECT the user on
+# every request. Entries are frozen snapshots rather than ORM instances, so
+# concurrent requests never share (or mutate) an object bound to another
+# request's session. update_user and delete_user invalidate this worker's
+# entry; other workers, and changes made outside the API (e.g. directly in
+# the database), take up to the TTL to revoke or demote a cached user.
+current_user_cache = LocalCache(maxsize=10000, ttl=30)
 
 async def get_current_user(
     token: Annotated[TokenPayload, Depends(get_current_token_payload)],
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> AuthenticatedUser:
     """
     Get the current authenticated user
     
@@ -21,45 +29,43 @@ async def get_current_user(
         db: Database session
         
     Returns:
-        Current user model
+        Snapshot of the current user, possibly up to the cache TTL old
         
     Raises:
         HTTPException: If user not found or inactive
     """
     try:
-        result = await db.execute(
-            select(User).where(User.id == int(token.sub))
-        )
-        user = result.scalar_one_or_none()
+        user_id = int(token.sub)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid user ID"
+        ) from e
+    
+    user = current_user_cache.get(user_id)
+    if user is None:
+        db_user = await db.get(User, user_id)
         
-        if not user:
+        if not db_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
-            
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Inactive user"
-            )
-            
-        return user
         
-    except ValueError as e:
+        user = AuthenticatedUser.model_validate(db_user)
+        current_user_cache.set(user_id, user)
+    
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid user ID"
-        ) from e
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Could not get current user"
-        ) from e
+            detail="Inactive user"
+        )
+    
+    return user
 
 async def get_current_active_superuser(
-    current_user: Annotated[User, Depends(get_current_user)]
-) -> User:
+    current_user: Annotated[AuthenticatedUser, Depends(get_current_user)]
+) -> AuthenticatedUser:
     """
     Get the current authenticated superuser
     
@@ -67,7 +73,7 @@ async def get_current_active_superuser(
         current_user: Current authenticated user
         
     Returns:
-        Current superuser model
+        Snapshot of the current superuser
         
     Raises:
         HTTPException: If user is not a superuser
@@ -80,5 +86,5 @@ async def get_current_active_superuser(
     return current_user
 
 DBSession = Annotated[AsyncSession, Depends(get_db)]
-CurrentUser = Annotated[User, Depends(get_current_user)]
-CurrentSuperUser = Annotated[User, Depends(get_current_active_superuser)]
\ No newline at end of file
+CurrentUser = Annotated[AuthenticatedUser, Depends(get_current_user)]
+CurrentSuperUser = Annotated[AuthenticatedUser, Depends(get_current_active_superuser)]
\ No newline at end of file
@@ -1,11 +1,45 @@
+import asyncio
 from typing import Callable
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 
-from app.db.sql import engine
+from app.core.config import settings
+from app.core.security import calibrate_password_hashing
+from app.db.sql import engine, raw_pool
+from app.services.cache_service import cache_service
 import logging
 
 logger = logging.getLogger("app")
 
+# Number of pooled connections opened at startup
+DB_POOL_PREWARM = 5
+
+async def prewarm_db_pool() -> None:
+    """
+    Open a few pooled connections up front so early requests don't pay connect cost
+    """
+    if settings.DB_USE_PGBOUNCER:
+        logger.info("Connection pooling delegated to PgBouncer, skipping pool pre-warm")
+        return
+    
+    pool_class = engine.pool.__class__.__name__
+    if pool_class != "AsyncAdaptedQueuePool":
+        logger.warning("Unexpected database pool class %s, expected AsyncAdaptedQueuePool", pool_class)
+    
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(DB_POOL_PREWARM)),
+        return_exceptions=True
+    )
+    errors = [r for r in results if isinstance(r, Exception)]
+    for connection in results:
+        if not isinstance(connection, Exception):
+            await connection.close()
+    
+    if errors:
+        logger.warning("Database pool pre-warm failed: %s", errors[0])
+    else:
+        logger.info("Database pool pre-warmed with %s connections", len(results))
+
 async def startup_handler() -> None:
     """
     Application startup handler
@@ -17,11 +51,24 @@ async def startup_handler() -> None:
         from app.models import user, country, city, file, image, home_destination
         
         logger.info("All models imported successfully")
+        
+        await prewarm_db_pool()
         logger.info("Database connection established")
+        
+        # asyncpg pool for the hottest read endpoints
+        await raw_pool.initialize()
+        
+        # Connect response cache (no-op when Redis is not configured)
+        await cache_service.initialize()
+        
+        # Time bcrypt and pick its cost for this machine (unless BCRYPT_ROUNDS
+        # pins it); runs a real hash, so off the loop
+        await run_in_threadpool(calibrate_password_hashing)
+        
         logger.info("Application startup completed successfully")
         
     except Exception as e:
-        logger.error(f"Error during application startup: {str(e)}")
+        logger.error("Error during application startup: %s", e)
         raise e
 
 async def shutdown_handler() -> None:
@@ -32,14 +79,17 @@ async def shutdown_handler() -> None:
     
     try:
         # Close database connections
+        await raw_pool.close()
         if engine:
             await engine.dispose()
             logger.info("Database connections closed")
         
+        await cache_service.close()
+        
         logger.info("Application shutdown completed successfully")
         
     except Exception as e:
-        logger.error(f"Error during application shutdown: {str(e)}")
+        logger.error("Error during application shutdown: %s", e)
         raise e
 
 def create_start_app_handler(app: FastAPI) -> Callable:
@@ -0,0 +1,53 @@
+from fastapi import FastAPI, Request
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.responses import ORJSONResponse
+from app.schemas.response import error_response
+import logging
+
+logger = logging.getLogger("api")
+
+async def db_error_handler(request: Request, exc: SQLAlchemyError) -> ORJSONResponse:
+    """
+    Translate unhandled database errors into a 500 response
+
+    The request's session is rolled back by get_db when the error propagates.
+    """
+    logger.error("Database error on %s %s: %s", request.method, request.url.path, exc)
+    return ORJSONResponse(
+        status_code=500,
+        content=error_response(
+            message="A database error occurred while processing your request",
+            status=500,
+            error_code="DATABASE_ERROR",
+            details={"error": str(exc)}
+        )
+    )
+
+async def generic_500_handler(request: Request, exc: Exception) -> ORJSONResponse:
+    """
+    Translate any other unhandled error into a 500 response
+    """
+    logger.error("Unhandled error on %s %s: %s", request.method, request.url.path, exc, exc_info=exc)
+    return ORJSONResponse(
+        status_code=500,
+        content=error_response(
+            message="An error occurred while processing your request",
+            status=500,
+            error_code="INTERNAL_SERVER_ERROR",
+            details={"error": str(exc)}
+        )
+    )
+
+def register_exception_handlers(app: FastAPI):
+    """
+    Register the application-wide error handlers
+
+    Route handlers only catch the errors they turn into specific 4xx responses
+    and leave everything else to these.
+
+    Args:
+        app: FastAPI application
+    """
+    app.add_exception_handler(SQLAlchemyError, db_error_handler)
+    app.add_exception_handler(Exception, generic_500_handler)
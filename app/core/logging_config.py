@@ -1,26 +1,62 @@
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
 
 def setup_logging():
     """
-    Simple logging configuration for the application
+    Logging configuration for the application
+
+    Request handlers only enqueue records; formatting and the stdout write
+    happen on a background QueueListener thread.
     """
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)]
+    global _listener
+    if _listener is not None:
+        return
+
+    # None of the formats use thread or process fields; skip collecting them
+    # for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     )
 
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # QueueHandler.prepare() merges args into the message; the listener's
+    # handler applies the real format
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+def stop_logging():
+    """
+    Flush queued records and stop the background logging thread
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 def get_logger(name: str = "app") -> logging.Logger:
     """
     Get a logger instance
-    
+
     Args:
         name: Logger name
-        
+
     Returns:
         Logger instance
     """
     return logging.getLogger(name)
-
- 
\ No newline at end of file
@@ -0,0 +1,14 @@
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson
+
+    orjson serializes dicts, lists, datetimes and UUIDs natively in C, which
+    keeps large list payloads off the pure-Python json encoder.
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -1,22 +1,68 @@
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Annotated, Optional
+import asyncio
+import logging
+import math
+import os
+import secrets
+import threading
+import time
 
+import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+import orjson
+from jose import JOSEError, jwk, jws
 from passlib.context import CryptContext
-from pydantic import ValidationError
 
 from app.core.config import settings
 from app.schemas.user import TokenPayload
+from app.services.cache_service import LocalCache
+
+logger = logging.getLogger("security")
 
 # Password hashing configuration
+BCRYPT_MIN_ROUNDS = 12
+BCRYPT_MAX_ROUNDS = 16
+# Hash time calibrate_password_hashing aims for on the current machine
+BCRYPT_TARGET_MS = 250
+# bcrypt ignores everything past this many bytes of the password
+BCRYPT_MAX_SECRET_BYTES = 72
+# Hash time above which startup warns that logins will be slow
+BCRYPT_SLOW_MS = 400
+
 pwd_context = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
-    bcrypt__rounds=12  # Increase work factor for better security
+    bcrypt__rounds=settings.BCRYPT_ROUNDS or BCRYPT_MIN_ROUNDS  # Increase work factor for better security
+)
+
+# Dedicated threads for password verification. bcrypt releases the GIL, so
+# these run on separate cores, and a burst of logins queues here instead of
+# taking every thread in the shared anyio pool that file I/O also uses.
+BCRYPT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 2,
+    thread_name_prefix="bcrypt"
 )
 
+# (rounds, hash) of a random secret, verified against when a login matches no
+# user. Rebuilt whenever the cost for new hashes changes so those logins take
+# as long as real ones.
+_dummy_hash: Optional[tuple] = None
+_dummy_hash_lock = threading.Lock()
+
+# Decoded access tokens by raw token string, so clients repeating the same
+# bearer token skip signature verification for a few seconds. The TTL is far
+# below the token lifetime, and exp is still checked on every hit.
+_token_payloads = LocalCache(maxsize=5000, ttl=10)
+
+# JWT signing key, parsed once so jose doesn't rebuild it on every encode/decode
+SIGNING_KEY = jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
+
+# Default access token lifetime
+ACCESS_TOKEN_EXPIRE = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
 # OAuth2 configuration
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_PREFIX}/auth/login"
@@ -28,7 +74,7 @@ def create_access_token(
 ) -> str:
     """
     Create a JWT access token
-    
+
     Args:
         subject: Token subject (usually user ID)
         expires_delta: Optional token expiration time
@@ -36,27 +82,25 @@ def create_access_token(
     Returns:
         Encoded JWT token
     """
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    
+    now = datetime.now(timezone.utc)
+    expire = now + (expires_delta or ACCESS_TOKEN_EXPIRE)
+
+    # Integer timestamps, as the JWT spec wants for exp/iat
     to_encode = {
-        "exp": expire,
+        "exp": int(expire.timestamp()),
         "sub": str(subject),
-        "iat": datetime.utcnow()  # Token creation time
+        "iat": int(now.timestamp())  # Token creation time
     }
-    
+
     try:
-        encoded_jwt = jwt.encode(
-            to_encode,
-            settings.SECRET_KEY,
+        # Claims serialized with orjson; jws only signs the bytes
+        encoded_jwt = jws.sign(
+            orjson.dumps(to_encode),
+            SIGNING_KEY,
             algorithm=settings.ALGORITHM
         )
         return encoded_jwt
-    except JWTError as e:
+    except JOSEError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Could not create access token"
@@ -65,7 +109,7 @@ def create_access_token(
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash
-    
+
     Args:
         plain_password: Plain text password
         hashed_password: Hashed password from database
@@ -73,15 +117,107 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
+    # Every stored hash is bcrypt, so skip passlib's scheme lookup;
+    # checkpw compares in constant time. bcrypt only uses the first 72
+    # bytes; passlib truncated silently when hashing, while bcrypt>=4.1
+    # raises on longer input, so truncate the same way here.
     try:
-        return pwd_context.verify(plain_password, hashed_password)
-    except Exception:
+        return bcrypt.checkpw(plain_password.encode()[:BCRYPT_MAX_SECRET_BYTES], hashed_password.encode())
+    except ValueError:
+        # Malformed or non-bcrypt stored hash
         return False
 
+def get_dummy_hash() -> str:
+    """
+    Hash of a random secret at the cost currently used for new hashes
+
+    Blocking when the hash has to be (re)built; call from a worker thread.
+
+    Returns:
+        Hashed password no login can match
+    """
+    global _dummy_hash
+    rounds = pwd_context.to_dict()["bcrypt__rounds"]
+    with _dummy_hash_lock:
+        if _dummy_hash is None or _dummy_hash[0] != rounds:
+            _dummy_hash = (rounds, pwd_context.hash(secrets.token_urlsafe(32)))
+        return _dummy_hash[1]
+
+def _verify_dummy_password(plain_password: str) -> bool:
+    return verify_password(plain_password, get_dummy_hash())
+
+async def verify_dummy_password(plain_password: str) -> None:
+    """
+    Spend one password verification on a login that matched no user
+
+    Unknown emails then cost the same bcrypt round as wrong passwords, so
+    response latency doesn't reveal which accounts exist.
+
+    Args:
+        plain_password: Plain text password from the login form
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(BCRYPT_EXECUTOR, _verify_dummy_password, plain_password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Run verify_password on BCRYPT_EXECUTOR without blocking the event loop
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(BCRYPT_EXECUTOR, verify_password, plain_password, hashed_password)
+
+def calibrate_password_hashing() -> int:
+    """
+    Benchmark bcrypt and, unless BCRYPT_ROUNDS is set, tune its cost
+
+    Each extra round doubles the hash time, so one timed hash at the current
+    cost is enough to pick the round count that takes about BCRYPT_TARGET_MS
+    here. The calibrated cost never drops below BCRYPT_MIN_ROUNDS. With
+    BCRYPT_ROUNDS set the cost is kept and only timed. Existing hashes keep
+    verifying since bcrypt stores the cost in the hash. Blocking; call from
+    a worker thread.
+
+    Returns:
+        The bcrypt rounds now used for new hashes
+    """
+    rounds = pwd_context.to_dict()["bcrypt__rounds"]
+    start = time.perf_counter()
+    pwd_context.hash("calibration")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if settings.BCRYPT_ROUNDS:
+        calibrated = rounds
+    else:
+        extra_rounds = math.floor(math.log2(BCRYPT_TARGET_MS / elapsed_ms)) if elapsed_ms > 0 else 0
+        calibrated = min(max(rounds + extra_rounds, BCRYPT_MIN_ROUNDS), BCRYPT_MAX_ROUNDS)
+        if calibrated != rounds:
+            pwd_context.update(bcrypt__rounds=calibrated)
+
+    logger.info("bcrypt cost %d took %.0fms, using cost %d", rounds, elapsed_ms, calibrated)
+
+    # Rebuild the dummy hash now so the first unknown-email login doesn't
+    # pay for it
+    get_dummy_hash()
+
+    expected_ms = elapsed_ms * 2 ** (calibrated - rounds)
+    if expected_ms > BCRYPT_SLOW_MS:
+        logger.warning(
+            "bcrypt cost %d takes about %.0fms per hash, over %dms; logins will be slow",
+            calibrated, expected_ms, BCRYPT_SLOW_MS
+        )
+    return calibrated
+
 def get_password_hash(password: str) -> str:
     """
     Hash a password
-    
+
     Args:
         password: Plain text password
         
@@ -95,7 +231,7 @@ async def get_current_token_payload(
 ) -> TokenPayload:
     """
     Decode and validate the current access token
-    
+
     Args:
         token: JWT token from request
         
@@ -105,29 +241,41 @@ async def get_current_token_payload(
     Raises:
         HTTPException: If token is invalid or expired
     """
+    token_data = _token_payloads.get(token)
+    if token_data is not None and token_data.exp > datetime.now(timezone.utc):
+        return token_data
+
     try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        token_data = TokenPayload(
-            sub=payload["sub"],
-            exp=datetime.fromtimestamp(payload["exp"])
-        )
-    except (JWTError, ValidationError) as e:
+        # jws checks the signature; the claims are parsed with orjson and
+        # checked here instead of by jose's jwt layer
+        payload = orjson.loads(jws.verify(token, SIGNING_KEY, algorithms=[settings.ALGORITHM]))
+    except (JOSEError, orjson.JSONDecodeError) as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         ) from e
-        
-    # Check if token has expired
-    if token_data.exp < datetime.utcnow():
+
+    exp = payload.get("exp") if isinstance(payload, dict) else None
+    sub = payload.get("sub") if isinstance(payload, dict) else None
+    if type(exp) is not int or not isinstance(sub, str):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    expires_at = datetime.fromtimestamp(exp, tz=timezone.utc)
+    if expires_at <= datetime.now(timezone.utc):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-        
-    return token_data
\ No newline at end of file
+
+    token_data = TokenPayload.model_construct(
+        sub=sub,
+        exp=expires_at
+    )
+    _token_payloads.set(token, token_data)
+    return token_data
@@ -1,28 +1,53 @@
 # from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import NullPool
 from sqlalchemy import event, text
 from app.core.config import settings
 
 # from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Optional
+import asyncpg
 import logging
+import orjson
 
 logger = logging.getLogger("database")
 
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON column values with orjson (asyncpg expects text)"""
+    return orjson.dumps(value).decode()
+
+if settings.DB_USE_PGBOUNCER:
+    # PgBouncer owns the pooling and may run each transaction on a different
+    # server connection, so keep no local pool and no prepared statements
+    pool_options = {"poolclass": NullPool}
+    connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+else:
+    pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_use_lifo": settings.DB_POOL_LIFO,  # Reuse the most recent connection so its PG plan/catalog cache stays warm
+    }
+    # Larger prepared statement cache so the repeated lookups (by id, by slug)
+    # stay prepared across requests on each pooled connection
+    connect_args = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+
+if not settings.DATABASE_URL.startswith('postgresql'):
+    connect_args = {"check_same_thread": False}
+
 # Create async engine with optimized pool settings
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG_MODE,
-    pool_size=20,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    connect_args={} if settings.DATABASE_URL.startswith('postgresql') else {"check_same_thread": False}
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args=connect_args,
+    **pool_options
 )
 
 # Create sessionmaker with optimized settings
@@ -44,13 +69,67 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     session = SessionLocal()
     try:
         yield session
-    except Exception as e:
-        logger.error(f"Database session error: {str(e)}")
-        await session.rollback()
-        raise e
     finally:
+        # Undo anything a failed or early-returning request left uncommitted;
+        # errors themselves are logged by the app-level exception handlers
+        if session.in_transaction():
+            await session.rollback()
         await session.close()
 
+class RawPostgresPool:
+    """
+    Plain asyncpg pool for the few hottest read paths
+
+    Queries run through asyncpg's own prepared statement cache, skipping
+    SQLAlchemy statement compilation and ORM row processing. All other
+    database access goes through the SQLAlchemy engine.
+    """
+    MIN_SIZE = 2
+    MAX_SIZE = 10
+
+    def __init__(self):
+        self.pool: Optional[asyncpg.Pool] = None
+
+    async def initialize(self):
+        """Create the pool; callers fall back to SQLAlchemy if this fails"""
+        if engine.url.get_backend_name() != "postgresql":
+            return
+
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        try:
+            self.pool = await asyncpg.create_pool(
+                dsn,
+                min_size=self.MIN_SIZE,
+                max_size=self.MAX_SIZE,
+                statement_cache_size=0 if settings.DB_USE_PGBOUNCER else settings.DB_STATEMENT_CACHE_SIZE,
+            )
+            logger.info("Raw asyncpg pool initialized")
+        except Exception as e:
+            logger.warning("Raw asyncpg pool initialization failed: %s", e)
+            self.pool = None
+
+    async def close(self):
+        """Close the pool"""
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+
+    async def fetchrow(self, query: str, *args) -> Optional[asyncpg.Record]:
+        """
+        Run a query and return its first row
+
+        Args:
+            query: SQL with $n placeholders
+            *args: Query parameters
+
+        Returns:
+            First row, or None if the query returned nothing
+        """
+        async with self.pool.acquire() as conn:
+            return await conn.fetchrow(query, *args)
+
+raw_pool = RawPostgresPool()
+
 # Add event listeners for connection pool management
 @event.listens_for(engine.sync_engine, "connect")
 def connect(dbapi_connection, connection_record):
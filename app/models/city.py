@@ -1,10 +1,11 @@
 import enum
 from geoalchemy2.types import Geometry
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, Enum, Index
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY
 from sqlalchemy.sql import func
 from typing import Optional
 from app.db.sql import Base
+from app.utility.utils import slugify
 
 class RegionEnum(str, enum.Enum):
     """Enumeration for world regions"""
@@ -54,14 +55,14 @@ class City(Base):
 
     # Primary key and timestamps
     id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Basic information
     name = Column(String, nullable=False)
     slug = Column(String, unique=True, index=True, nullable=False)
-    is_active = Column(Boolean, default=False, index=True)
-    order = Column(Integer, default=9999, index=True)
+    is_active = Column(Boolean, default=False)
+    order = Column(Integer, default=9999)
     
     # Relationships
     country_id = Column(Integer, ForeignKey('countries.id'), nullable=True)
@@ -70,7 +71,12 @@ class City(Base):
     
     # Location data
     location = Column(Geometry(geometry_type='POINT', srid=4326), nullable=True)
-    
+
+    __table_args__ = (
+        # Matches get_cities' is_active filter and ORDER BY order, created_at DESC;
+        # replaces the single-column created_at, is_active and order indexes
+        Index("ix_cities_active_order_created", is_active, order, created_at.desc()),
+    )
 
     @classmethod
     def build(
@@ -87,11 +93,7 @@ class City(Base):
        
         # Auto-generate slug if not provided
         if not slug:
-            import re
-            slug = name.lower().strip()
-            slug = re.sub(r'[\s_]+', '-', slug)
-            slug = re.sub(r'-+', '-', slug)
-            slug = slug.strip('-')
+            slug = slugify(name)
         
         return cls(
             name=name,
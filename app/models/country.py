@@ -2,8 +2,9 @@ from geoalchemy2.types import Geometry
 from sqlalchemy.future import select
 from typing import List, Optional
 
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, DateTime, Index, insert, update
 from app.db.sql import Base
+from app.utility.utils import slugify
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sqlalchemy.sql import func
@@ -17,11 +18,16 @@ class Country(Base):
     slug = Column(String, nullable=False, unique=True)
     showon_destmenu = Column(Boolean, default=False)
     location = Column(Geometry(geometry_type='POINT', srid=4326), nullable=True)
-    country_code = Column(String)
+    country_code = Column(String, unique=True)
     image_id = Column(Integer, ForeignKey("images.id"), nullable=True)
     image_url = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # Trigram index so name ILIKE '%term%' searches don't scan the table
+        Index("ix_countries_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
     
     # ✅ Build Method
     @classmethod
@@ -38,11 +44,7 @@ class Country(Base):
 
         # Auto-generate slug if not provided
         if not slug:
-            import re
-            slug = name.lower().strip()
-            slug = re.sub(r'[\s_]+', '-', slug)
-            slug = re.sub(r'-+', '-', slug)
-            slug = slug.strip('-')
+            slug = slugify(name)
         
         # Normalize country code to uppercase
         country_code = country_code.upper() if country_code else country_code
@@ -77,32 +79,45 @@ class Country(Base):
 
     @classmethod
     async def create(cls, db: AsyncSession, obj_in):
-        if hasattr(obj_in, 'dict'):
-            db_obj = cls(**obj_in.dict())
-        else:
-            db_obj = cls(**obj_in.__dict__)
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        to_dict = getattr(obj_in, 'dict', None)
+        obj_data = to_dict() if to_dict is not None else obj_in.__dict__
+        # INSERT ... RETURNING loads id and the server defaults in the same
+        # round trip; the caller owns the transaction
+        result = await db.execute(
+            insert(cls)
+            .values(**{k: v for k, v in obj_data.items() if k in COUNTRY_COLUMNS})
+            .returning(cls)
+        )
+        return result.scalar_one()
 
     @classmethod
     async def update(cls, db: AsyncSession, db_obj, obj_in):
-        if hasattr(obj_in, 'dict'):
-            obj_data = obj_in.dict(exclude_unset=True)
+        to_dict = getattr(obj_in, 'dict', None)
+        if to_dict is not None:
+            obj_data = to_dict(exclude_unset=True)
         else:
             obj_data = {k: v for k, v in obj_in.__dict__.items() if v is not None}
-        for field, value in obj_data.items():
-            setattr(db_obj, field, value)
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        values = {k: v for k, v in obj_data.items() if k in COUNTRY_COLUMNS}
+        if not values:
+            return db_obj
+        # UPDATE ... RETURNING refreshes db_obj (including updated_at) in place,
+        # so no follow-up SELECT; the caller owns the transaction
+        result = await db.execute(
+            update(cls)
+            .where(cls.id == db_obj.id)
+            .values(**values)
+            .returning(cls)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
 
     @classmethod
     async def remove(cls, db: AsyncSession, id: int):
         obj = await cls.get(db, id)
         if obj:
             await db.delete(obj)
-            await db.commit()
-        return obj
\ No newline at end of file
+            await db.flush()
+        return obj
+
+# Column names accepted by create/update; other input fields are ignored
+COUNTRY_COLUMNS = frozenset(Country.__table__.columns.keys())
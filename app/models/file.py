@@ -11,10 +11,36 @@ from uuid import uuid4
 from starlette.concurrency import run_in_threadpool
 
 import os
-import imghdr
 
 ALLOWED_EXTENSIONS = {"jpeg", "jpg", "png", "gif"}
 
+# Leading magic bytes of the allowed image formats
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "jpeg",
+    b"\x89PNG": "png",
+    b"GIF8": "gif",
+}
+
+# Storage bucket for get_blob when gcp_service has none, created on first use
+_bucket = None
+
+def _get_bucket():
+    """
+    Return a reusable bucket handle instead of building a client per call
+
+    bucket() makes no request, unlike get_bucket(), so the only HTTP call
+    left in get_blob is the blob lookup itself.
+    """
+    global _bucket
+    if gcp_service.bucket is not None:
+        return gcp_service.bucket
+    if _bucket is None:
+        _bucket = storage.Client().bucket(settings.GCP_BUCKET_NAME)
+    return _bucket
+
+def _get_blob_sync(blob_name):
+    return _get_bucket().get_blob(blob_name)
+
 
 class File(Base):
     __tablename__ = "files"
@@ -32,26 +58,37 @@ class File(Base):
 
     @classmethod
     async def build_by_field_storage_v2(cls, field_storage: UploadFile, supp_id=None, **kwargs):
+        # UploadFile's async read/seek only go to the threadpool once the
+        # spooled file has rolled over to disk; small uploads stay in memory
+        head_bytes = await field_storage.read(512)
+        await field_storage.seek(0)
+
         return await cls.build_by_file(
             input_file=field_storage.file,
             content_type=field_storage.content_type,
             filename=field_storage.filename,
             supp_id=supp_id,
+            head_bytes=head_bytes,
             **kwargs
         )
 
     @classmethod
-    async def build_by_file(cls, input_file, content_type, filename, supp_id=None, **kwargs):
-        # Read first 512 bytes in thread-safe way
-        head_bytes = await run_in_threadpool(input_file.read, 512)
-        extension = imghdr.what(None, h=head_bytes)
+    async def build_by_file(cls, input_file, content_type, filename, supp_id=None, head_bytes=None, **kwargs):
+        if head_bytes is None:
+            # Read first 512 bytes in thread-safe way
+            head_bytes = await run_in_threadpool(input_file.read, 512)
+
+            # Reset stream before upload
+            await run_in_threadpool(input_file.seek, 0)
+
+        extension = next(
+            (ext for sig, ext in IMAGE_SIGNATURES.items() if head_bytes.startswith(sig)),
+            None
+        )
 
         if extension not in ALLOWED_EXTENSIONS:
             raise HTTPException(status_code=400, detail="File type not allowed")
 
-        # Reset stream before upload
-        await run_in_threadpool(input_file.seek, 0)
-
         # Secure filename
         secure_name = secure_filename(filename)
         unique_filename = f"{uuid4().hex}_{secure_name}"
@@ -64,12 +101,12 @@ class File(Base):
         )
         public_url = result.get("public_url")
         blob_name = result.get("blob_name")
-        
 
-        # Reset and get file size
-        await run_in_threadpool(input_file.seek, 0)
-        full_content = await run_in_threadpool(input_file.read)
-        size = len(full_content)
+        # GCS reports the stored size; otherwise the upload left the stream
+        # at its end, so the position is the size
+        size = result.get("size")
+        if size is None:
+            size = input_file.tell()
 
         return cls(
             identifier=f"{uuid4().hex}-{os.path.splitext(secure_name)[0]}",
@@ -81,8 +118,8 @@ class File(Base):
             **kwargs
         )
     @classmethod
-    def get_blob(cls, blob_name):
-        storage_client = storage.Client()
-        bucket = storage_client.get_bucket(settings.GCP_BUCKET_NAME)
-        blob = bucket.get_blob(blob_name)
+    async def get_blob(cls, blob_name):
+        # The GCS client is blocking (and may build itself on first use), so
+        # the whole lookup runs in the threadpool
+        blob = await run_in_threadpool(_get_blob_sync, blob_name)
         return blob
\ No newline at end of file
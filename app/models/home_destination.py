@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.db.sql import Base
 from datetime import datetime
@@ -12,8 +12,13 @@ class HomePageDestinations(Base):
     is_active = Column(Boolean, default=False, index=True)
     city = Column(String, nullable=False)
     order = Column(Integer, unique=True, index=True, nullable=False)
-    image = Column(Integer, ForeignKey("files.id"), nullable=True)
+    image = Column(Integer, ForeignKey("files.id"), nullable=True, index=True)
     image_url = Column(String, nullable=True)
+
+    __table_args__ = (
+        # Trigram index so city ILIKE '%term%' searches don't scan the table
+        Index("ix_home_page_destinations_city_trgm", "city", postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"}),
+    )
     
     @classmethod
     def build(cls, **kwargs):
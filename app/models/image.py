@@ -1,4 +1,6 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, JSON
+import re
+
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Index, Text, JSON
 from sqlalchemy.sql import func
 from typing import Optional
 from fastapi import HTTPException
@@ -6,6 +8,17 @@ from fastapi import HTTPException
 from app.db.sql import Base
 from app.models.file import File
 
+# ImageKit host URL (customize as needed)
+IMAGEKIT_HOST_URL = "https://example.com/images"
+
+# Storage URL prefixes rewritten to IMAGEKIT_HOST_URL. The bucket paths are
+# optional inside the match, so they win over the bare storage host.
+STORAGE_URL_PREFIX_RE = re.compile(
+    r"^(?:https://storage\.googleapis\.com"
+    r"(?:/(?:staging-luxe|preproduction-ratedapartments)\.appspot\.com)?"
+    r"|https?://lh3\.googleusercontent\.com)"
+)
+
 class Image(Base):
     """
     Image model for storing image metadata and relationships
@@ -37,6 +50,12 @@ class Image(Base):
     # Additional metadata
     image_score = Column(JSON, nullable=True)
 
+    __table_args__ = (
+        # Matches get_images' default filter and ORDER BY (order, id), so list
+        # pages and keyset seeks are index range scans instead of a sort
+        Index("ix_images_order_id_active", order, id, postgresql_where=(is_deleted == False)),
+    )
+
 
     @classmethod
     def build(
@@ -52,9 +71,8 @@ class Image(Base):
     ) -> "Image":
         # Normalize filename
         if filename:
-            filename = filename.lower().strip()
-            import re
-            filename = re.sub(r'\s+', '-', filename)
+            # split() drops edge whitespace and splits on runs, same as strip + \s+ -> '-'
+            filename = '-'.join(filename.lower().split())
         
         # Set premier_image_url if not provided
         if not premier_image_url:
@@ -76,12 +94,8 @@ class Image(Base):
         
         if file:
             try:
-                # If file has a blob_name, try to get the blob
-                if hasattr(file, 'blob_name') and file.blob_name:
-                    blob = File.get_blob(file.blob_name)
-                    public_url = blob.public_url if blob else file.public_url
-                else:
-                    public_url = file.public_url
+                # public_url is stored at upload time; no need to look the blob up again
+                public_url = file.public_url
                 
                 # Try to process with ImageKit-style URL if available
                 imagekit_url = cls.replace_image_from_string(public_url) if public_url else None
@@ -94,8 +108,8 @@ class Image(Base):
                 })
 
                 # Set filename if not provided
-                if not kwargs.get("filename") and hasattr(file, 'filename'):
-                    kwargs["filename"] = file.filename
+                if not kwargs.get("filename"):
+                    kwargs["filename"] = getattr(file, 'filename', None)
                     
             except Exception as e:
                 raise HTTPException(
@@ -140,23 +154,5 @@ class Image(Base):
         """
         if not url:
             return None
-            
-        # Define URL patterns that should be replaced
-        existing_urls = [
-            "https://storage.googleapis.com/staging-luxe.appspot.com",
-            "https://storage.googleapis.com/preproduction-ratedapartments.appspot.com",
-            "https://storage.googleapis.com",
-            "https://lh3.googleusercontent.com",
-            "http://lh3.googleusercontent.com",
-        ]
-
-        # ImageKit host URL (customize as needed)
-        imagekit_host_url = "https://example.com/images"
-
-        # Replace known URL patterns
-        for prefix in existing_urls:
-            if url.startswith(prefix):
-                return url.replace(prefix, imagekit_host_url)
-
-        # Return original URL if no transformation is needed
-        return url  
\ No newline at end of file
+
+        return STORAGE_URL_PREFIX_RE.sub(IMAGEKIT_HOST_URL, url, count=1)  
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 from typing import Optional
 
@@ -16,6 +16,11 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # Backs get_users' ORDER BY created_at DESC, id DESC for offset and keyset pages
+        Index("ix_users_created_at_id", created_at.desc(), id.desc()),
+    )
+
     # ✅ Build Methods
     @classmethod
     def build_from_form(
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
 
+from app.schemas.types import SlugStr
+
 class CityBase(BaseModel):
     """Base city schema with common attributes"""
     name: str = Field(..., min_length=1, max_length=100, description="City name")
@@ -14,25 +16,9 @@ class CityBase(BaseModel):
 
 class CityCreate(CityBase):
     """Schema for creating a new city"""
-    name: str = Field(..., min_length=1, max_length=100, description="City name")
-    slug: str = Field(..., min_length=1, max_length=100, description="URL-friendly city identifier")
+    slug: SlugStr = Field(..., description="URL-friendly city identifier")
     country_id: int = Field(..., description="Associated country ID")
 
-    @field_validator('slug')
-    @classmethod
-    def validate_slug(cls, v):
-        """Ensure slug is lowercase and URL-friendly"""
-        if v:
-            # Convert to lowercase and replace spaces with hyphens
-            v = v.lower().strip()
-            # Replace multiple spaces/hyphens with single hyphen
-            import re
-            v = re.sub(r'[\s_]+', '-', v)
-            v = re.sub(r'-+', '-', v)
-            # Remove leading/trailing hyphens
-            v = v.strip('-')
-        return v
-
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -49,28 +35,13 @@ class CityCreate(CityBase):
 class CityUpdate(BaseModel):
     """Schema for updating a city"""
     name: Optional[str] = Field(None, min_length=1, max_length=100, description="City name")
-    slug: Optional[str] = Field(None, min_length=1, max_length=100, description="URL-friendly city identifier")
+    slug: Optional[SlugStr] = Field(None, description="URL-friendly city identifier")
     is_active: Optional[bool] = Field(None, description="Whether city is active")
     country_id: Optional[int] = Field(None, description="Associated country ID")
     image_id: Optional[int] = Field(None, description="Associated image ID")
     image_url: Optional[str] = Field(None, description="City image URL")
     order: Optional[int] = Field(None, ge=0, le=9999, description="Display order")
 
-    @field_validator('slug')
-    @classmethod
-    def validate_slug(cls, v):
-        """Ensure slug is lowercase and URL-friendly"""
-        if v:
-            # Convert to lowercase and replace spaces with hyphens
-            v = v.lower().strip()
-            # Replace multiple spaces/hyphens with single hyphen
-            import re
-            v = re.sub(r'[\s_]+', '-', v)
-            v = re.sub(r'-+', '-', v)
-            # Remove leading/trailing hyphens
-            v = v.strip('-')
-        return v
-
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -108,6 +79,14 @@ class CityOut(CityBase):
 # Alias for backward compatibility
 CityResponse = CityOut
 
+class CityBrief(BaseModel):
+    """Minimal city reference embedded in other responses"""
+    id: int = Field(..., description="City ID")
+    name: str = Field(..., description="City name")
+    slug: str = Field(..., description="URL-friendly city identifier")
+
+    model_config = ConfigDict(from_attributes=True)
+
 class CityWithCountry(CityOut):
     """Schema for city with country information"""
     country_name: Optional[str] = Field(None, description="Country name")
@@ -1,7 +1,10 @@
 from typing import Optional, List, Any
-from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 from datetime import datetime
 
+from app.schemas.city import CityBrief
+from app.schemas.types import CountryCodeStr, SlugStr
+
 
 # ✅ Shared properties
 class CountryBase(BaseModel):
@@ -15,34 +18,10 @@ class CountryBase(BaseModel):
 # ✅ Used for POST / create
 class CountryCreate(CountryBase):
     """Schema for creating a new country"""
-    name: str = Field(..., min_length=1, max_length=100, description="Country name")
-    slug: str = Field(..., min_length=1, max_length=100, description="URL-friendly country identifier")
-    country_code: str = Field(..., min_length=2, max_length=3, description="ISO country code")
+    slug: SlugStr = Field(..., description="URL-friendly country identifier")
+    country_code: CountryCodeStr = Field(..., description="ISO country code")
     location: Optional[str] = Field(None, max_length=255, description="Geographic location description")
     image_id: Optional[int] = Field(None, description="Associated image ID")
-    image_url: Optional[str] = Field(None, description="Country image URL")
-    showon_destmenu: bool = Field(default=False, description="Show on destination menu")
-
-    @field_validator('slug')
-    @classmethod
-    def validate_slug(cls, v):
-        """Ensure slug is lowercase and URL-friendly"""
-        if v:
-            # Convert to lowercase and replace spaces with hyphens
-            v = v.lower().strip()
-            # Replace multiple spaces/hyphens with single hyphen
-            import re
-            v = re.sub(r'[\s_]+', '-', v)
-            v = re.sub(r'-+', '-', v)
-            # Remove leading/trailing hyphens
-            v = v.strip('-')
-        return v
-
-    @field_validator('country_code')
-    @classmethod  
-    def validate_country_code(cls, v):
-        """Ensure country code is uppercase (ISO standard)"""
-        return v.upper() if v else v
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -62,34 +41,13 @@ class CountryCreate(CountryBase):
 class CountryUpdate(BaseModel):
     """Schema for updating a country"""
     name: Optional[str] = Field(None, min_length=1, max_length=100, description="Country name")
-    slug: Optional[str] = Field(None, min_length=1, max_length=100, description="URL-friendly country identifier")
-    country_code: Optional[str] = Field(None, min_length=2, max_length=3, description="ISO country code")
+    slug: Optional[SlugStr] = Field(None, description="URL-friendly country identifier")
+    country_code: Optional[CountryCodeStr] = Field(None, description="ISO country code")
     location: Optional[str] = Field(None, max_length=255, description="Geographic location description")
     image_id: Optional[int] = Field(None, description="Associated image ID")
     image_url: Optional[str] = Field(None, description="Country image URL")
     showon_destmenu: Optional[bool] = Field(None, description="Show on destination menu")
 
-    @field_validator('slug')
-    @classmethod
-    def validate_slug(cls, v):
-        """Ensure slug is lowercase and URL-friendly"""
-        if v:
-            # Convert to lowercase and replace spaces with hyphens
-            v = v.lower().strip()
-            # Replace multiple spaces/hyphens with single hyphen
-            import re
-            v = re.sub(r'[\s_]+', '-', v)
-            v = re.sub(r'-+', '-', v)
-            # Remove leading/trailing hyphens
-            v = v.strip('-')
-        return v
-
-    @field_validator('country_code')
-    @classmethod
-    def validate_country_code(cls, v):
-        """Ensure country code is uppercase (ISO standard)"""
-        return v.upper() if v else v
-
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -101,6 +59,23 @@ class CountryUpdate(BaseModel):
     )
 
 
+def location_to_str(location: Any) -> Optional[str]:
+    """Convert PostGIS geometry to string representation"""
+    # Common case first: no location, or one already stored as text
+    if location is None or isinstance(location, str):
+        return location
+
+    if hasattr(location, 'data'):
+        # This is a PostGIS WKBElement - convert to WKT string
+        # For now, return a placeholder - in production you'd convert properly
+        return "Geographic coordinates available"
+
+    try:
+        return str(location)
+    except Exception:
+        return None
+
+
 # ✅ Common DB response base
 class CountryOut(CountryBase):
     """Schema for country responses"""
@@ -114,24 +89,7 @@ class CountryOut(CountryBase):
     @field_serializer('location')
     def serialize_location(self, location: Any) -> Optional[str]:
         """Convert PostGIS geometry to string representation"""
-        if location is None:
-            return None
-        
-        # Handle different types of location data
-        if isinstance(location, str):
-            return location
-        
-        # Handle PostGIS WKBElement (geometry data)
-        try:
-            if hasattr(location, 'data'):
-                # This is a PostGIS WKBElement - convert to WKT string
-                from geoalchemy2 import functions
-                # For now, return a placeholder - in production you'd convert properly
-                return "Geographic coordinates available"
-            else:
-                return str(location)
-        except Exception:
-            return None
+        return location_to_str(location)
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -160,7 +118,7 @@ CountryInDB = CountryOut
 class CountryWithCities(CountryOut):
     """Schema for country with cities information"""
     cities_count: int = Field(default=0, description="Number of cities in this country")
-    cities: Optional[List[dict]] = Field(None, description="List of cities in this country")
+    cities: Optional[List[CityBrief]] = Field(None, description="List of cities in this country")
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -2,6 +2,8 @@ from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
 
+from app.utility.utils import utc_now
+
 
 class FileBase(BaseModel):
     """Base file schema with common attributes"""
@@ -108,7 +110,7 @@ class FileUploadResponse(BaseModel):
     """Schema for file upload responses"""
     file: FileOut = Field(..., description="Uploaded file data")
     message: str = Field(..., description="Success message")
-    upload_time: datetime = Field(default_factory=lambda: datetime.utcnow(), description="Upload timestamp")
+    upload_time: datetime = Field(default_factory=utc_now, description="Upload timestamp")
 
     model_config = ConfigDict(
         json_schema_extra={
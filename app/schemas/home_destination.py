@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
 from typing import Optional, List
 
+from app.schemas.types import CityKeyStr
+
 class HomeDestinationBase(BaseModel):
     """Base schema for home destinations"""
     city: str = Field(..., min_length=1, max_length=100, description="City name")
@@ -10,19 +12,9 @@ class HomeDestinationBase(BaseModel):
 
 class HomeDestinationCreate(HomeDestinationBase):
     """Schema for creating a home destination"""
-    city: str = Field(..., min_length=1, max_length=100, description="City name")
-    order: int = Field(..., ge=1, le=999, description="Display order (1-999)")
+    city: CityKeyStr = Field(..., description="City name")
     image_url: Optional[str] = Field(None, description="Destination image URL")
 
-    @field_validator('city')
-    @classmethod
-    def validate_city(cls, v):
-        """Normalize city name to lowercase for consistency in searching"""
-        if v:
-            # Convert to lowercase and normalize for search consistency
-            v = v.lower().strip()
-        return v
-    
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -36,20 +28,11 @@ class HomeDestinationCreate(HomeDestinationBase):
 
 class HomeDestinationUpdate(BaseModel):
     """Schema for updating a home destination"""
-    city: Optional[str] = Field(None, min_length=1, max_length=100, description="City name")
+    city: Optional[CityKeyStr] = Field(None, description="City name")
     order: Optional[int] = Field(None, ge=1, le=999, description="Display order (1-999)")
     is_active: Optional[bool] = Field(None, description="Whether destination is active")
     image_url: Optional[str] = Field(None, description="Destination image URL")
 
-    @field_validator('city')
-    @classmethod
-    def validate_city(cls, v):
-        """Normalize city name to lowercase for consistency in searching"""
-        if v:
-            # Convert to lowercase and normalize for search consistency
-            v = v.lower().strip()
-        return v
-
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -3,6 +3,8 @@ from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime
 from typing import Optional, List
 
+from app.utility.utils import utc_now
+
 
 class ImageBase(BaseModel):
     """Base image schema with common attributes"""
@@ -124,9 +126,10 @@ class ImageResponse(ImageOut):
 class ImageListResponse(BaseModel):
     """Schema for image list responses"""
     images: List[ImageOut] = Field(..., description="List of images")
-    total: int = Field(..., description="Total number of images")
+    total: Optional[int] = Field(None, description="Total number of images; not computed when paging by cursor")
     page: int = Field(..., description="Current page number")
     limit: int = Field(..., description="Items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there may be one")
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -144,7 +147,7 @@ class ImageUploadResponse(BaseModel):
     """Schema for image upload responses"""
     image: ImageOut = Field(..., description="Uploaded image data")
     message: str = Field(..., description="Success message")
-    upload_time: datetime = Field(default_factory=lambda: datetime.utcnow(), description="Upload timestamp")
+    upload_time: datetime = Field(default_factory=utc_now, description="Upload timestamp")
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -2,11 +2,13 @@ from pydantic import BaseModel, Field
 from typing import Any, Optional, List, Union
 from datetime import datetime
 
+from app.utility.utils import utc_now
+
 class BaseResponse(BaseModel):
     """Base response model for all API endpoints"""
     status: int = Field(..., description="HTTP status code")
     message: str = Field(..., description="Response message")
-    timestamp: datetime = Field(default_factory=lambda: datetime.utcnow(), description="Response timestamp")
+    timestamp: datetime = Field(default_factory=utc_now, description="Response timestamp")
 
 class SuccessResponse(BaseResponse):
     """Success response model with data"""
@@ -0,0 +1,15 @@
+from typing import Annotated
+
+from pydantic import AfterValidator, Field
+
+from app.utility.utils import slugify
+
+def normalize_city_key(value: str) -> str:
+    """Lowercase and trim a city name so searches match consistently"""
+    return value.lower().strip()
+
+# Input field types that normalize their value after the length checks; used
+# instead of per-model field_validator methods
+SlugStr = Annotated[str, Field(min_length=1, max_length=100), AfterValidator(slugify)]
+CountryCodeStr = Annotated[str, Field(min_length=2, max_length=3), AfterValidator(str.upper)]
+CityKeyStr = Annotated[str, Field(min_length=1, max_length=100), AfterValidator(normalize_city_key)]
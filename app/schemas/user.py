@@ -147,12 +147,25 @@ class UserInDB(UserBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class AuthenticatedUser(BaseModel):
+    """Immutable snapshot of the authenticated user, safe to share across requests"""
+    id: int = Field(..., description="User ID")
+    email: str = Field(..., description="User email address")
+    username: str = Field(..., description="Username")
+    is_active: bool = Field(..., description="Whether user is active")
+    is_superuser: bool = Field(..., description="Whether user has admin privileges")
+    created_at: Optional[datetime] = Field(None, description="Creation timestamp")
+    updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
 class UserListResponse(BaseModel):
     """Schema for user list responses"""
     users: List[UserOut] = Field(..., description="List of users")
-    total: int = Field(..., description="Total number of users")
+    total: Optional[int] = Field(None, description="Total number of users; not computed when paging by cursor")
     page: int = Field(..., description="Current page number")
     limit: int = Field(..., description="Items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there may be one")
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -1,5 +1,7 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
+from starlette.concurrency import run_in_threadpool
 from typing import BinaryIO, Optional
 
 from app.core.config import settings
@@ -7,6 +9,14 @@ import logging
 
 logger = logging.getLogger("services")
 
+# Uploads above the threshold are sent as multipart uploads in parts of this
+# size, so memory per upload stays bounded to a few parts
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=UPLOAD_CHUNK_SIZE,
+    multipart_chunksize=UPLOAD_CHUNK_SIZE,
+)
+
 class AWSService:
     def __init__(self):
         self.s3_client = None
@@ -26,12 +36,15 @@ class AWSService:
             else:
                 logger.warning("AWS credentials not provided, S3 client not initialized")
         except Exception as e:
-            logger.error(f"Error initializing AWS S3 client: {e}")
+            logger.error("Error initializing AWS S3 client: %s", e)
     
-    def upload_file(self, file_obj: BinaryIO, object_name: str, content_type: Optional[str] = None) -> dict:
+    async def upload_file(self, file_obj: BinaryIO, object_name: str, content_type: Optional[str] = None) -> dict:
         """
         Upload a file to an S3 bucket
         
+        boto3 is blocking, so the upload runs in the threadpool and the event
+        loop keeps serving other requests meanwhile.
+        
         Args:
             file_obj: File object to upload
             object_name: S3 object name
@@ -40,6 +53,9 @@ class AWSService:
         Returns:
             dict: Upload result with status and details
         """
+        return await run_in_threadpool(self._upload_file_sync, file_obj, object_name, content_type)
+    
+    def _upload_file_sync(self, file_obj: BinaryIO, object_name: str, content_type: Optional[str] = None) -> dict:
         if not self.s3_client:
             error_msg = "AWS S3 client not initialized"
             logger.error(error_msg)
@@ -50,7 +66,7 @@ class AWSService:
             }
 
         try:
-            logger.info(f"Starting file upload to S3: {object_name}")
+            logger.info("Starting file upload to S3: %s", object_name)
             
             extra_args = {}
             if content_type:
@@ -60,13 +76,14 @@ class AWSService:
                 file_obj,
                 settings.AWS_S3_BUCKET,
                 object_name,
-                ExtraArgs=extra_args
+                ExtraArgs=extra_args,
+                Config=UPLOAD_TRANSFER_CONFIG
             )
             
             # Generate URL for the uploaded file
             url = f"https://{settings.AWS_S3_BUCKET}.s3.{settings.AWS_REGION}.amazonaws.com/{object_name}"
             
-            logger.info(f"Successfully uploaded file to S3: {object_name}")
+            logger.info("Successfully uploaded file to S3: %s", object_name)
             
             return {
                 "success": True,
@@ -113,7 +130,7 @@ class AWSService:
             }
 
         try:
-            logger.info(f"Generating presigned URL for S3 object: {object_name}")
+            logger.info("Generating presigned URL for S3 object: %s", object_name)
             
             response = self.s3_client.generate_presigned_url(
                 'get_object',
@@ -124,7 +141,7 @@ class AWSService:
                 ExpiresIn=expiration
             )
             
-            logger.info(f"Successfully generated presigned URL for: {object_name}")
+            logger.info("Successfully generated presigned URL for: %s", object_name)
             
             return {
                 "success": True,
@@ -170,14 +187,14 @@ class AWSService:
             }
 
         try:
-            logger.info(f"Deleting file from S3: {object_name}")
+            logger.info("Deleting file from S3: %s", object_name)
             
             self.s3_client.delete_object(
                 Bucket=settings.AWS_S3_BUCKET,
                 Key=object_name
             )
             
-            logger.info(f"Successfully deleted file from S3: {object_name}")
+            logger.info("Successfully deleted file from S3: %s", object_name)
             
             return {
                 "success": True,
@@ -222,7 +239,7 @@ class AWSService:
             }
 
         try:
-            logger.info(f"Listing files from S3 with prefix: {prefix}")
+            logger.info("Listing files from S3 with prefix: %s", prefix)
             
             response = self.s3_client.list_objects_v2(
                 Bucket=settings.AWS_S3_BUCKET,
@@ -241,7 +258,7 @@ class AWSService:
                     for obj in response['Contents']
                 ]
             
-            logger.info(f"Successfully listed {len(files)} files from S3")
+            logger.info("Successfully listed %s files from S3", len(files))
             
             return {
                 "success": True,
@@ -0,0 +1,201 @@
+import functools
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger("services")
+
+class CacheService:
+    def __init__(self):
+        self.redis = None
+        self.prefix = settings.CACHE_PREFIX
+
+    async def initialize(self):
+        """Connect to Redis if REDIS_URL is configured"""
+        if not settings.REDIS_URL:
+            logger.info("Redis not configured, response caching disabled")
+            return
+
+        try:
+            self.redis = aioredis.from_url(settings.REDIS_URL)
+            await self.redis.ping()
+            logger.info("Redis cache initialized successfully")
+        except Exception as e:
+            logger.warning("Redis cache initialization failed: %s. Application will continue without caching.", e)
+            self.redis = None
+
+    async def close(self):
+        """Close the Redis connection pool"""
+        if self.redis:
+            await self.redis.close()
+            self.redis = None
+
+    def build_key(self, namespace: str, func: Callable, kwargs: dict) -> str:
+        """
+        Build a cache key from the endpoint and its parameters
+
+        The database session is injected per request and would make every key
+        unique, so AsyncSession arguments are left out of the key.
+
+        Args:
+            namespace: Cache namespace used for invalidation
+            func: Cached endpoint function
+            kwargs: Endpoint keyword arguments
+
+        Returns:
+            str: Cache key
+        """
+        params = sorted(
+            (name, value) for name, value in kwargs.items()
+            if not isinstance(value, AsyncSession)
+        )
+        digest = hashlib.md5(
+            repr((func.__module__, func.__qualname__, params)).encode()
+        ).hexdigest()
+        return f"{self.prefix}:{namespace}:{digest}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or Redis error"""
+        if not self.redis:
+            return None
+
+        try:
+            value = await self.redis.get(key)
+        except Exception as e:
+            logger.warning("Error reading cache key %s: %s", key, e)
+            return None
+        return orjson.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any, expire: int):
+        """Store a JSON-compatible value under key for expire seconds"""
+        if not self.redis:
+            return
+
+        try:
+            await self.redis.set(key, orjson.dumps(value), ex=expire)
+        except Exception as e:
+            logger.warning("Error writing cache key %s: %s", key, e)
+
+    async def get_raw(self, key: str) -> Optional[bytes]:
+        """Return the stored bytes for key, or None on a miss or Redis error"""
+        if not self.redis:
+            return None
+
+        try:
+            return await self.redis.get(key)
+        except Exception as e:
+            logger.warning("Error reading cache key %s: %s", key, e)
+            return None
+
+    async def set_raw(self, key: str, value: bytes, expire: int):
+        """Store already-serialized bytes under key for expire seconds"""
+        if not self.redis:
+            return
+
+        try:
+            await self.redis.set(key, value, ex=expire)
+        except Exception as e:
+            logger.warning("Error writing cache key %s: %s", key, e)
+
+    async def clear(self, namespace: str):
+        """Invalidate every cached entry in namespace"""
+        if not self.redis:
+            return
+
+        try:
+            keys = [key async for key in self.redis.scan_iter(match=f"{self.prefix}:{namespace}:*")]
+            if keys:
+                await self.redis.delete(*keys)
+        except Exception as e:
+            logger.warning("Error clearing cache namespace %s: %s", namespace, e)
+
+    def cached(self, namespace: str, expire: Optional[int] = None):
+        """
+        Cache the serialized JSON response of an async endpoint in Redis
+
+        The response body is stored as bytes and a hit is returned as-is, so
+        cached responses skip both the database and serialization. Endpoints
+        returning a Response are cached only for 200 responses.
+
+        Args:
+            namespace: Cache namespace, cleared by the endpoints that write to it
+            expire: TTL in seconds (defaults to settings.CACHE_EXPIRE_SECONDS)
+        """
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                if not self.redis:
+                    return await func(*args, **kwargs)
+
+                key = self.build_key(namespace, func, kwargs)
+                cached_body = await self.get_raw(key)
+                if cached_body is not None:
+                    return Response(content=cached_body, media_type="application/json")
+
+                result = await func(*args, **kwargs)
+                ttl = expire or settings.CACHE_EXPIRE_SECONDS
+                if isinstance(result, Response):
+                    if result.status_code == 200:
+                        await self.set_raw(key, result.body, ttl)
+                else:
+                    await self.set_raw(key, orjson.dumps(jsonable_encoder(result)), ttl)
+                return result
+
+            return wrapper
+        return decorator
+
+class LocalCache:
+    """
+    Small process-local LRU cache with a per-entry TTL
+
+    Meant for hot, rarely changing lookups where even a Redis round trip is
+    too slow. Entries are per worker, so writers must call clear() and other
+    workers may serve a stale entry for up to ttl seconds.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any):
+        """Store value under key, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Any):
+        """Drop a single entry"""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        self._entries.clear()
+
+# Create a global instance
+cache_service = CacheService()
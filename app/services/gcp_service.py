@@ -3,12 +3,26 @@ from fastapi import HTTPException
 from starlette.concurrency import run_in_threadpool
 
 import logging
+import os
 from typing import BinaryIO, Optional, Dict, Any
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Part size for resumable uploads; bounds memory to one chunk per upload
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+def _remaining_size(file_obj: BinaryIO) -> Optional[int]:
+    """Bytes left to read in a seekable stream, or None if it can't be measured"""
+    try:
+        position = file_obj.tell()
+        end = file_obj.seek(0, os.SEEK_END)
+        file_obj.seek(position)
+    except (AttributeError, OSError):
+        return None
+    return end - position
+
 class GCPService:
     def __init__(self):
         self.storage_client = None
@@ -26,11 +40,11 @@ class GCPService:
                     self.bucket = self.storage_client.bucket(settings.GCP_BUCKET_NAME)
                     logger.info("GCP Storage client initialized successfully")
                 else:
-                    logger.warning(f"GCP credentials file not found at: {settings.GOOGLE_APPLICATION_CREDENTIALS}")
+                    logger.warning("GCP credentials file not found at: %s", settings.GOOGLE_APPLICATION_CREDENTIALS)
             else:
                 logger.info("GCP credentials not configured, Storage client will not be initialized")
         except Exception as e:
-            logger.warning(f"GCP Storage client initialization failed: {e}. Application will continue without GCP storage.")
+            logger.warning("GCP Storage client initialization failed: %s. Application will continue without GCP storage.", e)
             self.storage_client = None
             self.bucket = None
     
@@ -49,16 +63,22 @@ class GCPService:
             if content_type:
                 blob.content_type = content_type
 
-            blob.upload_from_file(file_obj)
+            # With a known size, files up to 8 MiB go up in a single request;
+            # larger ones stream as a resumable upload one chunk at a time
+            # instead of the client's 100 MiB default buffer
+            blob.chunk_size = UPLOAD_CHUNK_SIZE
+            blob.upload_from_file(file_obj, size=_remaining_size(file_obj))
             blob.make_public()
 
             return {
                 "blob_name": blob.name,
-                "public_url": blob.public_url
+                "public_url": blob.public_url,
+                # Filled in from the upload response's object resource
+                "size": blob.size
             }
 
         except Exception as e:
-            logger.error(f"Error uploading file to GCP Storage: {e}")
+            logger.error("Error uploading file to GCP Storage: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
         
     async def generate_signed_url(self, object_name: str, expiration: int = 3600) -> str:
@@ -80,7 +100,20 @@ class GCPService:
             return url
 
         except Exception as e:
-            logger.error(f"❌ Error generating signed URL: {e}")
+            logger.error("❌ Error generating signed URL: %s", e)
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def delete_file(self, object_name: str) -> None:
+        if not self.storage_client or not self.bucket:
+            raise HTTPException(status_code=500, detail="GCP Storage client not initialized")
+
+        await run_in_threadpool(self._delete_file_sync, object_name)
+
+    def _delete_file_sync(self, object_name: str) -> None:
+        try:
+            self.bucket.blob(object_name).delete()
+        except Exception as e:
+            logger.error("Error deleting file from GCP Storage: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
 
   
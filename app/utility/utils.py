@@ -2,9 +2,27 @@
 Utility functions for the FastAPI application
 """
 
+import base64
+import binascii
 import re
 import unicodedata
-from typing import Optional
+from datetime import datetime, timezone
+from typing import List, Optional
+
+# Any run of whitespace, underscores and hyphens becomes one hyphen in a slug
+SLUG_COLLAPSE_RE = re.compile(r'[\s_\-]+')
+
+def utc_now() -> datetime:
+    """
+    Current time as a timezone-aware UTC datetime.
+    
+    Used as a default_factory instead of the deprecated datetime.utcnow(),
+    which returns a naive value.
+    
+    Returns:
+        Aware datetime in UTC
+    """
+    return datetime.now(timezone.utc)
 
 def secure_filename(filename: str) -> str:
     """
@@ -70,6 +88,21 @@ def generate_slug(text: str) -> str:
     
     return slug
 
+def slugify(name: str) -> str:
+    """
+    Build the default slug for a model name.
+    
+    Unlike generate_slug, punctuation is kept; whitespace and underscores
+    collapse into single hyphens.
+    
+    Args:
+        name: Name to convert to slug
+        
+    Returns:
+        Lowercase hyphen-separated slug
+    """
+    return SLUG_COLLAPSE_RE.sub('-', name.lower().strip()).strip('-')
+
 # Helper functions that might be useful for future features
 def validate_email(email: str) -> bool:
     """
@@ -206,3 +239,33 @@ def generate_unique_identifier(prefix: str = "", length: int = 8) -> str:
         return f"{prefix}_{random_part}"
     
     return random_part
+
+def encode_cursor(*values) -> str:
+    """
+    Encode keyset pagination values into an opaque cursor.
+    
+    Args:
+        values: Sort key values of the last row on the page
+        
+    Returns:
+        URL-safe base64 cursor string
+    """
+    raw = "|".join(str(value) for value in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str, parts: int) -> Optional[List[str]]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Cursor string from a previous page
+        parts: Number of values the cursor must contain
+        
+    Returns:
+        List of the raw string values, or None if the cursor is malformed
+    """
+    try:
+        values = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    return values if len(values) == parts else None
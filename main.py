@@ -8,6 +8,8 @@ from fastapi.middleware.gzip import GZipMiddleware
 from app.api.routes import router as api_router
 from app.core.config import settings
 from app.core.events import create_start_app_handler, create_stop_app_handler
+from app.core.exception_handlers import register_exception_handlers
+from app.core.responses import ORJSONResponse
 from app.core.logging_config import setup_logging
 import logging
 
@@ -38,6 +40,7 @@ app = FastAPI(
     redoc_url="/redoc",  # Always enable redoc for development
     openapi_url="/openapi.json",  # Always enable openapi for development
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure TrustedHostMiddleware only for production
@@ -73,6 +76,9 @@ app.add_middleware(
 # Compression Middleware
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+# Application-wide 500 handlers
+register_exception_handlers(app)
+
 # Include routes
 app.include_router(api_router, prefix=settings.API_PREFIX)
 